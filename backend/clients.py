@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from groq import AsyncGroq
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.AsyncClient] = None
+_groq_client: Optional[AsyncGroq] = None
+_counters = {"requests": 0, "in_flight": 0, "errors": 0}
+_http2_enabled = False
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _counters["requests"] += 1
+        _counters["in_flight"] += 1
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            _counters["errors"] += 1
+            raise
+        finally:
+            _counters["in_flight"] -= 1
+        if response.status_code >= 500 or response.status_code == 429:
+            _counters["errors"] += 1
+        return response
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    global _http2_enabled
+    http2 = settings.groq_http2 and _http2_available()
+    _http2_enabled = http2
+    if settings.groq_http2 and not http2:
+        logger.info("HTTP/2 requested for Groq but the 'h2' package is missing; using HTTP/1.1")
+    transport = _CountingTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.groq_max_connections,
+            max_keepalive_connections=settings.groq_max_keepalive_connections,
+            keepalive_expiry=settings.groq_keepalive_expiry_seconds,
+        ),
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=5.0),
+    )
+
+
+def get_groq_client() -> Optional[AsyncGroq]:
+    """Return the shared AsyncGroq client used for chat and transcription calls."""
+
+    global _http_client, _groq_client
+    if _groq_client is not None or not settings.groq_api_key:
+        return _groq_client
+    with _lock:
+        if _groq_client is None:
+            _http_client = _build_http_client()
+            _groq_client = AsyncGroq(
+                api_key=settings.groq_api_key,
+                http_client=_http_client,
+                max_retries=settings.groq_max_retries,
+            )
+    return _groq_client
+
+
+async def init_clients() -> None:
+    get_groq_client()
+
+
+async def close_clients() -> None:
+    global _http_client, _groq_client
+    with _lock:
+        http_client, _http_client, _groq_client = _http_client, None, None
+    if http_client is not None:
+        await http_client.aclose()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection-pool usage for the shared Groq HTTP client."""
+
+    stats: Dict[str, Any] = {
+        "initialized": _http_client is not None,
+        "http2": _http2_enabled,
+        "max_connections": settings.groq_max_connections,
+        "max_keepalive_connections": settings.groq_max_keepalive_connections,
+        **_counters,
+    }
+    transport = getattr(_http_client, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    stats["open_connections"] = len(connections)
+    stats["idle_connections"] = sum(1 for connection in connections if connection.is_idle())
+    stats["active_connections"] = stats["open_connections"] - stats["idle_connections"]
+    return stats
@@ -8,18 +8,87 @@ from pymongo import MongoClient
 
 load_dotenv()
 
+INTERVIEW_DOMAINS = [
+    "Sales",
+    "Python Developer",
+    "Full Stack Developer",
+    "Data Science",
+]
+EXPERIENCE_LEVELS = ["Intern", "Fresher", "Medium", "Senior"]
+
 
 class Settings(BaseModel):
     mongo_uri: str = os.getenv("MONGO_URI", "")
     mongo_db_name: str = os.getenv("MONGO_DB_NAME", "interview_practice")
+    mongo_max_pool_size: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    mongo_min_pool_size: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+    mongo_server_selection_timeout_ms: int = int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+    )
+    # Write concern for committed answer turns: "majority" (default) or a node count.
+    mongo_turn_write_concern: str = os.getenv("MONGO_TURN_WRITE_CONCERN", "majority")
     groq_api_key: str = os.getenv("GROQ_API_KEY", "")
     groq_model: str = os.getenv(
         "GROQ_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct"
     )
+    groq_fast_models: str = os.getenv("GROQ_FAST_MODELS", "llama-3.1-8b-instant")
+    groq_quality_models: str = os.getenv("GROQ_QUALITY_MODELS", "")
+    router_window: int = int(os.getenv("ROUTER_WINDOW", "100"))
+    router_slow_p95_seconds: float = float(os.getenv("ROUTER_SLOW_P95_SECONDS", "8"))
     groq_voice: str = os.getenv("GROQ_VOICE", "")
     gtts_language: str = os.getenv("GTTS_LANGUAGE", "en")
     backend_host: str = os.getenv("BACKEND_HOST", "0.0.0.0")
     backend_port: int = int(os.getenv("BACKEND_PORT", "8000"))
+    interviewer_parallel_candidates: int = int(
+        os.getenv("INTERVIEWER_PARALLEL_CANDIDATES", "1")
+    )
+    interviewer_input_token_budget: int = int(
+        os.getenv("INTERVIEWER_INPUT_TOKEN_BUDGET", "1800")
+    )
+    evaluator_input_token_budget: int = int(
+        os.getenv("EVALUATOR_INPUT_TOKEN_BUDGET", "4000")
+    )
+    evaluator_chunk_threshold_tokens: int = int(
+        os.getenv("EVALUATOR_CHUNK_THRESHOLD_TOKENS", "2500")
+    )
+    evaluator_chunk_turns: int = int(os.getenv("EVALUATOR_CHUNK_TURNS", "6"))
+    evaluator_map_concurrency: int = int(os.getenv("EVALUATOR_MAP_CONCURRENCY", "3"))
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+    llm_cache_ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    llm_cache_mongo: bool = os.getenv("LLM_CACHE_MONGO", "false").lower() == "true"
+    llm_cache_call_types: str = os.getenv(
+        "LLM_CACHE_CALL_TYPES", "evaluator,evaluator_window,turn_scorer"
+    )
+    session_cache_max_entries: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "1000"))
+    session_cache_ttl_seconds: float = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "900"))
+    archive_enabled: bool = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+    archive_after_days: float = float(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+    archive_interval_seconds: float = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+    archive_batch_size: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+    archive_codec: str = os.getenv("ARCHIVE_CODEC", "zstd")
+    export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", "200"))
+    # Empty disables /interviews/export; ``python -m db.export`` works regardless.
+    export_admin_token: str = os.getenv("EXPORT_ADMIN_TOKEN", "")
+    turn_scoring_enabled: bool = os.getenv("TURN_SCORING_ENABLED", "true").lower() == "true"
+    groq_max_connections: int = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+    groq_max_keepalive_connections: int = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    groq_keepalive_expiry_seconds: float = float(os.getenv("GROQ_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    groq_http2: bool = os.getenv("GROQ_HTTP2", "true").lower() == "true"
+    groq_max_retries: int = int(os.getenv("GROQ_MAX_RETRIES", "1"))
+    llm_timeout_seconds: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+    stt_timeout_seconds: float = float(os.getenv("STT_TIMEOUT_SECONDS", "30"))
+    request_deadline_seconds: float = float(os.getenv("REQUEST_DEADLINE_SECONDS", "45"))
+    breaker_failure_threshold: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    breaker_reset_seconds: float = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+    evaluation_workers: int = int(os.getenv("EVALUATION_WORKERS", "4"))
+    evaluation_max_attempts: int = int(os.getenv("EVALUATION_MAX_ATTEMPTS", "3"))
+    evaluation_stream_grace_seconds: float = float(
+        os.getenv("EVALUATION_STREAM_GRACE_SECONDS", "10")
+    )
+    opening_pool_enabled: bool = os.getenv("OPENING_POOL_ENABLED", "true").lower() == "true"
+    opening_pool_size: int = int(os.getenv("OPENING_POOL_SIZE", "3"))
+    opening_pool_low_watermark: int = int(os.getenv("OPENING_POOL_LOW_WATERMARK", "1"))
+    opening_pool_ttl_seconds: int = int(os.getenv("OPENING_POOL_TTL_SECONDS", "3600"))
 
 
 @lru_cache
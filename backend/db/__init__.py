@@ -1,3 +1,60 @@
-from .mongo import get_db, get_interviews_collection, get_mongo_client
+from .mongo import (
+    close_mongo,
+    get_db,
+    get_evaluation_jobs_collection,
+    get_interview_archive_collection,
+    get_interview_turns_collection,
+    get_interviews_collection,
+    get_llm_cache_collection,
+    get_mongo_client,
+    get_users_collection,
+    init_mongo,
+)
+from .export import (
+    EXPORT_FORMATS,
+    EXPORT_MAX_BATCH_SIZE,
+    EXPORT_MEDIA_TYPES,
+    ExportError,
+    columnar_available,
+    export_chunks,
+    export_filter,
+)
+from .indexes import INDEXES, ensure_indexes
+from .repositories import (
+    CLOSED_STATUSES,
+    INTERVIEW_STATUSES,
+    TURNS_PER_BUCKET,
+    InterviewRepository,
+    UserRepository,
+    get_interviews_repository,
+    get_users_repository,
+)
 
-__all__ = ["get_mongo_client", "get_db", "get_interviews_collection"]
+__all__ = [
+    "get_mongo_client",
+    "init_mongo",
+    "close_mongo",
+    "get_db",
+    "get_users_collection",
+    "get_interviews_collection",
+    "get_interview_turns_collection",
+    "get_interview_archive_collection",
+    "get_evaluation_jobs_collection",
+    "get_llm_cache_collection",
+    "EXPORT_FORMATS",
+    "EXPORT_MAX_BATCH_SIZE",
+    "EXPORT_MEDIA_TYPES",
+    "ExportError",
+    "columnar_available",
+    "export_chunks",
+    "export_filter",
+    "INDEXES",
+    "ensure_indexes",
+    "CLOSED_STATUSES",
+    "INTERVIEW_STATUSES",
+    "TURNS_PER_BUCKET",
+    "UserRepository",
+    "InterviewRepository",
+    "get_users_repository",
+    "get_interviews_repository",
+]
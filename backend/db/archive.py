@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+import zlib
+from typing import Any, Dict, Tuple
+
+import bson
+
+from config import settings
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+logger = logging.getLogger(__name__)
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def archive_codec() -> str:
+    """The configured codec, falling back to stdlib zlib when ``zstandard`` is missing."""
+
+    codec = settings.archive_codec.strip().lower()
+    if codec == CODEC_ZSTD and not zstd_available():
+        logger.warning("ARCHIVE_CODEC=zstd but the 'zstandard' package is missing; using zlib")
+        return CODEC_ZLIB
+    return codec if codec in (CODEC_ZSTD, CODEC_ZLIB) else CODEC_ZLIB
+
+
+def compress_document(document: Dict[str, Any], codec: str) -> Tuple[bytes, int]:
+    """BSON-encode and compress ``document``; returns the payload and the raw size."""
+
+    raw = bson.encode(document)
+    if codec == CODEC_ZSTD:
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw), len(raw)
+    return zlib.compress(raw, ZLIB_LEVEL), len(raw)
+
+
+def decompress_document(payload: bytes, codec: str) -> Dict[str, Any]:
+    if codec == CODEC_ZSTD:
+        if not zstd_available():
+            raise RuntimeError("Archived interview is zstd-compressed; install 'zstandard' to read it")
+        import zstandard
+
+        raw = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec == CODEC_ZLIB:
+        raw = zlib.decompress(payload)
+    else:
+        raise RuntimeError(f"Unknown archive codec: {codec}")
+    return bson.decode(raw)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import struct
+import sys
+from datetime import datetime, timezone
+from itertools import zip_longest
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from bson import ObjectId
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+
+from .mongo import get_interview_archive_collection, get_interview_turns_collection, get_interviews_collection
+from .repositories import INTERVIEW_STATUSES, InterviewRepository
+
+EXPORT_FORMATS = ("ndjson", "parquet", "arrow")
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+DEFAULT_BATCH_SIZE = settings.export_batch_size
+EXPORT_MAX_BATCH_SIZE = 5000
+# Transcripts are flattened into rows; per-session indexes and notes are left out.
+_HEADER_PROJECTION = {"question_signatures": 0, "turn_notes": 0, "summary": 0, "resume_context": 0}
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown format, missing optional dependency, bad filter)."""
+
+
+def columnar_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_filter(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    domain: Optional[str] = None,
+    status: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Mongo filter for the export; dates bound the session start via its ``_id``."""
+
+    query: Dict[str, Any] = {}
+    id_range: Dict[str, ObjectId] = {}
+    if since is not None:
+        id_range["$gte"] = _id_bound(since)
+    if until is not None:
+        id_range["$lt"] = _id_bound(until)
+    if id_range:
+        query["_id"] = id_range
+    if domain:
+        query["domain"] = domain
+    if status:
+        if status not in INTERVIEW_STATUSES:
+            raise ExportError(f"Unknown interview status: {status}")
+        query["status"] = status
+    return query
+
+
+def _id_bound(value: datetime) -> ObjectId:
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    try:
+        return ObjectId.from_datetime(value)
+    except (OverflowError, struct.error):
+        # ObjectId timestamps are unsigned 32-bit seconds (1970-2106).
+        raise ExportError(f"Date out of range: {value.isoformat()}")
+
+
+def _json_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {**row, "started_at": row["started_at"].isoformat()}
+
+
+def _session_rows(session: Dict[str, Any], turns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    verdict = session.get("verdict") or {}
+    base = {
+        "interview_id": str(session["_id"]),
+        "user_id": session.get("user_id"),
+        "domain": session.get("domain"),
+        "experience": session.get("experience"),
+        "status": session.get("status"),
+        "started_at": session["_id"].generation_time,
+        "feedback_status": session.get("feedback_status"),
+        "verdict_label": verdict.get("label"),
+        "verdict_score": verdict.get("score"),
+    }
+    if InterviewRepository.is_bucketed(session):
+        questions = [turn.get("question") for turn in turns] + [session.get("current_question")]
+        answers = [turn.get("answer") for turn in turns]
+        behaviors = [turn.get("behavior") for turn in turns]
+    else:
+        questions = list(session.get("questions") or [])
+        answers = list(session.get("answers") or [])
+        behaviors = list(session.get("behaviors") or [])
+    rows = []
+    for turn, (question, answer) in enumerate(zip_longest(questions, answers)):
+        if question is None and answer is None:
+            continue
+        rows.append(
+            {
+                **base,
+                "turn": turn,
+                "question": question,
+                "answer": answer,
+                "behavior": behaviors[turn] if turn < len(behaviors) else None,
+            }
+        )
+    return rows
+
+
+async def iter_export_batches(
+    query: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield flattened rows for ``batch_size`` sessions at a time, oldest first."""
+
+    interviews = get_interviews_collection()
+    turns_collection = get_interview_turns_collection()
+    archive_collection = get_interview_archive_collection()
+    if interviews is None or turns_collection is None or archive_collection is None:
+        raise RuntimeError("Database not configured")
+    batch_size = max(1, min(batch_size, EXPORT_MAX_BATCH_SIZE))
+    cursor = interviews.find(query, _HEADER_PROJECTION).sort("_id", 1).batch_size(batch_size)
+    batch: List[Dict[str, Any]] = []
+    async for session in cursor:
+        batch.append(session)
+        if len(batch) >= batch_size:
+            yield await _flatten_batch(turns_collection, archive_collection, batch)
+            batch = []
+    if batch:
+        yield await _flatten_batch(turns_collection, archive_collection, batch)
+
+
+async def _flatten_batch(
+    turns_collection, archive_collection, sessions: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    archived = [session["_id"] for session in sessions if session.get("status") == "archived"]
+    bucketed = [
+        session["_id"]
+        for session in sessions
+        if InterviewRepository.is_bucketed(session) and session.get("status") != "archived"
+    ]
+    turns: Dict[ObjectId, List[Dict[str, Any]]] = {}
+    if bucketed:
+        committed = {session["_id"]: int(session.get("turn_count") or 0) for session in sessions}
+        async for bucket in turns_collection.find({"interview_id": {"$in": bucketed}}, {"interview_id": 1, "turns": 1}):
+            # A turn appended for a submit whose header update never landed is not part of the session.
+            turns.setdefault(bucket["interview_id"], []).extend(
+                turn for turn in bucket["turns"] if turn["turn"] < committed[bucket["interview_id"]]
+            )
+    unpacked: Dict[ObjectId, Dict[str, Any]] = {}
+    if archived:
+        async for document in archive_collection.find({"_id": {"$in": archived}}):
+            session, turns[document["_id"]] = InterviewRepository.unpack_archive(document)
+            unpacked[document["_id"]] = session
+    rows: List[Dict[str, Any]] = []
+    for session in sessions:
+        session = unpacked.get(session["_id"], session)
+        session_turns = sorted(turns.get(session["_id"], []), key=lambda turn: turn["turn"])
+        rows.extend(_session_rows(session, session_turns))
+    return rows
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("interview_id", pa.string()),
+            ("user_id", pa.string()),
+            ("domain", pa.string()),
+            ("experience", pa.string()),
+            ("status", pa.string()),
+            ("started_at", pa.timestamp("s", tz="UTC")),
+            ("feedback_status", pa.string()),
+            ("verdict_label", pa.string()),
+            ("verdict_score", pa.float64()),
+            ("turn", pa.int32()),
+            ("question", pa.string()),
+            ("answer", pa.string()),
+            ("behavior", pa.string()),
+        ]
+    )
+
+
+async def export_chunks(
+    fmt: str, query: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """Encode the export as ``fmt``, yielding bytes once per batch of sessions."""
+
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown export format: {fmt}")
+    if fmt == "ndjson":
+        async for rows in iter_export_batches(query, batch_size):
+            yield "".join(json.dumps(_json_row(row)) + "\n" for row in rows).encode("utf-8")
+        return
+    if not columnar_available():
+        raise ExportError(f"The {fmt} export needs the 'pyarrow' package")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+
+    def encode(rows: List[Dict[str, Any]]) -> bytes:
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+        return sink.drain()
+
+    try:
+        async for rows in iter_export_batches(query, batch_size):
+            if rows:
+                # Columnar encoding is CPU work; keep it off the event loop.
+                chunk = await run_in_threadpool(encode, rows)
+                if chunk:
+                    yield chunk
+    finally:
+        writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an ISO date, got {value!r}")
+
+
+async def _export_to(path: str, fmt: str, query: Dict[str, Any], batch_size: int) -> None:
+    out = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        async for chunk in export_chunks(fmt, query, batch_size):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+# ``python -m db.export --format parquet --out interviews.parquet --since 2025-01-01`` from backend/.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream interviews as one row per question/answer.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--out", default="-", help="output file, or - for stdout")
+    parser.add_argument("--since", type=_parse_date, help="sessions started on or after this date")
+    parser.add_argument("--until", type=_parse_date, help="sessions started before this date")
+    parser.add_argument("--domain")
+    parser.add_argument("--status", choices=INTERVIEW_STATUSES)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(
+            _export_to(
+                args.out,
+                args.format,
+                export_filter(args.since, args.until, args.domain, args.status),
+                args.batch_size,
+            )
+        )
+    except ExportError as exc:
+        parser.error(str(exc))
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+# ``users`` is only ever read by ``_id``, so it needs no secondary index yet.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "interviews": [
+        # Per-candidate history and stats: filter by user and status, newest (_id) first.
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("_id", DESCENDING)],
+            name="user_status_id",
+        ),
+        # Archival scans completed sessions oldest first.
+        IndexModel([("status", ASCENDING), ("_id", ASCENDING)], name="status_id"),
+    ],
+    "interview_turns": [
+        # One document per (interview, bucket); appends and window reads hit this index.
+        IndexModel([("interview_id", ASCENDING), ("bucket", ASCENDING)], name="interview_bucket", unique=True),
+    ],
+    "evaluation_jobs": [
+        # The sweep looks for queued jobs and for running jobs with an expired lease.
+        IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)], name="status_updated"),
+    ],
+    "llm_cache": [
+        # TTL: Mongo deletes entries once ``expires_at`` has passed.
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_1", expireAfterSeconds=0),
+    ],
+}
+
+# (collection, filter, sort) for the queries on the request path, checked by the CLI.
+HOT_QUERIES: List[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]]]] = [
+    ("interviews", {"_id": ObjectId(), "user_id": ""}, None),
+    ("interviews", {"user_id": "", "status": {"$in": ["active", "completed", "archived"]}}, [("_id", DESCENDING)]),
+    ("interview_turns", {"interview_id": ObjectId(), "bucket": {"$gte": 0, "$lte": 1}}, None),
+    ("evaluation_jobs", {"status": "queued"}, None),
+    ("llm_cache", {"_id": "", "expires_at": {"$gt": datetime.now(timezone.utc)}}, None),
+]
+
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """Create every registered index; returns the index names applied per collection."""
+
+    db = get_db()
+    if db is None:
+        return {}
+    applied: Dict[str, List[str]] = {}
+    try:
+        for name, models in INDEXES.items():
+            collection = db[name]
+            try:
+                applied[name] = await collection.create_indexes(models)
+            except OperationFailure as exc:
+                # Usually an existing index with the same name but different options.
+                logger.warning("Could not apply indexes on %s: %s", name, exc)
+                applied[name] = []
+                for model in models:
+                    try:
+                        applied[name].extend(await collection.create_indexes([model]))
+                    except OperationFailure as model_exc:
+                        logger.warning("Skipping index %s on %s: %s", model.document["name"], name, model_exc)
+    except PyMongoError as exc:
+        logger.warning("Index setup skipped, database unavailable: %s", exc)
+    return applied
+
+
+async def index_usage() -> Dict[str, List[Dict[str, Any]]]:
+    """``$indexStats`` for every registered collection: accesses per index since restart."""
+
+    db = get_db()
+    if db is None:
+        return {}
+    usage: Dict[str, List[Dict[str, Any]]] = {}
+    for name in INDEXES:
+        stats = await db[name].aggregate([{"$indexStats": {}}]).to_list(None)
+        usage[name] = [
+            {
+                "index": entry["name"],
+                "key": dict(entry["key"]),
+                "ops": entry["accesses"]["ops"],
+                "since": entry["accesses"]["since"].isoformat(),
+            }
+            for entry in stats
+        ]
+    return usage
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages") or []:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_hot_queries() -> List[Dict[str, Any]]:
+    """Winning plan stages of each hot query; ``COLLSCAN`` means an index is missing."""
+
+    db = get_db()
+    if db is None:
+        return []
+    report = []
+    for name, query, sort in HOT_QUERIES:
+        cursor = db[name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explained = await cursor.explain()
+        stages = _plan_stages(explained["queryPlanner"]["winningPlan"])
+        report.append(
+            {
+                "collection": name,
+                "filter": sorted(query),
+                "sort": [field for field, _ in sort or []],
+                "stages": stages,
+                "collection_scan": "COLLSCAN" in stages,
+            }
+        )
+    return report
+
+
+async def _report() -> Dict[str, Any]:
+    await ensure_indexes()
+    return {"indexes": await index_usage(), "hot_queries": await explain_hot_queries()}
+
+
+# ``python -m db.indexes`` from backend/: per-index $indexStats plus hot-query plans.
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(_report()), indent=2, default=str))
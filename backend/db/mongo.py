@@ -1,33 +1,97 @@
-from functools import lru_cache
+import threading
 from typing import Optional
 
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 from config import settings
 
 LOCAL_FALLBACK_URI = "mongodb://localhost:27017"
 
+_lock = threading.Lock()
+_client: Optional[AsyncIOMotorClient] = None
 
-@lru_cache
-def get_mongo_client() -> Optional[MongoClient]:
+
+def _build_client() -> Optional[AsyncIOMotorClient]:
     uri = settings.mongo_uri or LOCAL_FALLBACK_URI
     try:
-        return MongoClient(uri)
+        return AsyncIOMotorClient(
+            uri,
+            maxPoolSize=settings.mongo_max_pool_size,
+            minPoolSize=settings.mongo_min_pool_size,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+        )
     except Exception:
         return None
 
 
-def get_db() -> Optional[Database]:
+def get_mongo_client() -> Optional[AsyncIOMotorClient]:
+    """Return the shared Motor client."""
+
+    global _client
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is None:
+            _client = _build_client()
+    return _client
+
+
+async def init_mongo() -> None:
+    get_mongo_client()
+
+
+async def close_mongo() -> None:
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def get_db() -> Optional[AsyncIOMotorDatabase]:
     client = get_mongo_client()
     if not client or not settings.mongo_db_name:
         return None
     return client[settings.mongo_db_name]
 
 
-def get_interviews_collection() -> Optional[Collection]:
+def get_users_collection() -> Optional[AsyncIOMotorCollection]:
+    db = get_db()
+    if db is None:
+        return None
+    return db["users"]
+
+
+def get_interviews_collection() -> Optional[AsyncIOMotorCollection]:
     db = get_db()
     if db is None:
         return None
     return db["interviews"]
+
+
+def get_interview_turns_collection() -> Optional[AsyncIOMotorCollection]:
+    db = get_db()
+    if db is None:
+        return None
+    return db["interview_turns"]
+
+
+def get_interview_archive_collection() -> Optional[AsyncIOMotorCollection]:
+    db = get_db()
+    if db is None:
+        return None
+    return db["interview_archive"]
+
+
+def get_evaluation_jobs_collection() -> Optional[AsyncIOMotorCollection]:
+    db = get_db()
+    if db is None:
+        return None
+    return db["evaluation_jobs"]
+
+
+def get_llm_cache_collection() -> Optional[AsyncIOMotorCollection]:
+    db = get_db()
+    if db is None:
+        return None
+    return db["llm_cache"]
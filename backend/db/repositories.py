@@ -0,0 +1,473 @@
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from bson import Binary, ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.write_concern import WriteConcern
+
+from config import settings
+
+from .archive import compress_document, decompress_document
+from .mongo import (
+    get_interview_archive_collection,
+    get_interview_turns_collection,
+    get_interviews_collection,
+    get_users_collection,
+)
+
+Document = Dict[str, Any]
+
+# Interview documents at this version keep their turns in ``interview_turns`` buckets.
+SCHEMA_BUCKETED = 2
+TURNS_PER_BUCKET = 20
+INTERVIEW_STATUSES = ("active", "completed", "archived")
+# Sessions that no longer take answers; archived ones are completed sessions moved to cold storage.
+CLOSED_STATUSES = ("completed", "archived")
+# What an archived session keeps in ``interviews``; the rest lives in ``interview_archive``.
+_STUB_FIELDS = (
+    "user_id",
+    "domain",
+    "experience",
+    "status",
+    "schema_version",
+    "turn_count",
+    "feedback_status",
+    "verdict",
+)
+# Answered turns, for sessions from before ``turn_count`` too, without shipping the arrays.
+_TURNS_EXPRESSION = {"$ifNull": ["$turn_count", {"$size": {"$ifNull": ["$answers", []]}}]}
+
+
+class UserRepository:
+    """Async access to the ``users`` collection."""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def create(self, document: Mapping[str, Any]) -> ObjectId:
+        result = await self.collection.insert_one(dict(document))
+        return result.inserted_id
+
+    async def get(self, user_id: ObjectId, projection: Optional[Mapping[str, Any]] = None) -> Optional[Document]:
+        return await self.collection.find_one({"_id": user_id}, projection)
+
+    async def set_resume_context(self, user_id: ObjectId, resume_context: str) -> None:
+        await self.collection.update_one({"_id": user_id}, {"$set": {"resume_context": resume_context}})
+
+
+class InterviewRepository:
+    """Async access to the ``interviews`` collection and its turn buckets."""
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        turns_collection: AsyncIOMotorCollection,
+        archive_collection: AsyncIOMotorCollection,
+        turn_write_concern: Optional[WriteConcern] = None,
+    ):
+        self.collection = collection
+        self.turns_collection = turns_collection
+        self.archive_collection = archive_collection
+        # Committed answers are acknowledged durably (journaled, by default on a
+        # majority) since callers may serve the next turn from memory afterwards.
+        if turn_write_concern is not None:
+            self._durable_collection = collection.with_options(write_concern=turn_write_concern)
+            self._durable_turns = turns_collection.with_options(write_concern=turn_write_concern)
+            self._durable_archive = archive_collection.with_options(write_concern=turn_write_concern)
+        else:
+            self._durable_collection = collection
+            self._durable_turns = turns_collection
+            self._durable_archive = archive_collection
+
+    @staticmethod
+    def is_bucketed(session: Mapping[str, Any]) -> bool:
+        return int(session.get("schema_version") or 1) >= SCHEMA_BUCKETED
+
+    @staticmethod
+    def _filter(interview_id: ObjectId, user_id: Optional[str], extra: Optional[Mapping[str, Any]] = None) -> Document:
+        query: Document = {"_id": interview_id}
+        if user_id is not None:
+            query["user_id"] = user_id
+        if extra:
+            query.update(extra)
+        return query
+
+    async def create(self, document: Mapping[str, Any]) -> ObjectId:
+        result = await self.collection.insert_one(dict(document))
+        return result.inserted_id
+
+    async def get(
+        self,
+        interview_id: ObjectId,
+        user_id: Optional[str] = None,
+        projection: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Document]:
+        return await self.collection.find_one(self._filter(interview_id, user_id), projection)
+
+    async def get_recent(self, interview_id: ObjectId, user_id: str, turns: int) -> Optional[Document]:
+        """Load a session with only its last ``turns`` questions and ``turns - 1`` answers."""
+
+        session = await self.collection.find_one(
+            self._filter(interview_id, user_id),
+            {
+                "questions": {"$slice": -turns},
+                "answers": {"$slice": -(turns - 1)},
+                "behaviors": 0,
+                "turn_notes": 0,
+            },
+        )
+        if session is not None and self.is_bucketed(session):
+            answered = int(session.get("turn_count") or 0)
+            self._attach_turns(session, await self._bucket_turns(interview_id, answered - (turns - 1), answered))
+        return session
+
+    async def get_transcript(self, interview_id: ObjectId, user_id: Optional[str] = None) -> Optional[Document]:
+        """Load a whole session, with every turn, in the inline array shape."""
+
+        session = await self.get(interview_id, user_id)
+        if session is not None and session.get("status") == "archived":
+            return await self.get_archived(interview_id, user_id)
+        if session is not None and self.is_bucketed(session):
+            self._attach_turns(
+                session, await self._bucket_turns(interview_id, 0, int(session.get("turn_count") or 0))
+            )
+        return session
+
+    async def turns(self, session: Mapping[str, Any], start: int, end: int) -> List[Document]:
+        """Answered turns ``start <= turn < end`` as ``{turn, question, answer}`` documents."""
+
+        if self.is_bucketed(session):
+            return await self._bucket_turns(session["_id"], start, end)
+        pairs = zip(session.get("questions") or [], session.get("answers") or [])
+        return [
+            {"turn": turn, "question": question, "answer": answer}
+            for turn, (question, answer) in enumerate(pairs)
+        ][max(0, start):end]
+
+    async def _bucket_turns(self, interview_id: ObjectId, start: int, end: int) -> List[Document]:
+        start = max(0, start)
+        if end <= start:
+            return []
+        cursor = self.turns_collection.find(
+            {
+                "interview_id": interview_id,
+                "bucket": {"$gte": start // TURNS_PER_BUCKET, "$lte": (end - 1) // TURNS_PER_BUCKET},
+            },
+            {"turns": 1},
+        )
+        turns = [turn async for bucket in cursor for turn in bucket["turns"] if start <= turn["turn"] < end]
+        return sorted(turns, key=itemgetter("turn"))
+
+    @staticmethod
+    def _attach_turns(session: Document, turns: List[Document]) -> None:
+        session["questions"] = [turn["question"] for turn in turns] + [session.get("current_question") or ""]
+        session["answers"] = [turn["answer"] for turn in turns]
+        session["behaviors"] = [turn.get("behavior") for turn in turns]
+
+    async def record_turn(
+        self,
+        session: Mapping[str, Any],
+        user_id: str,
+        answer: str,
+        next_question: Optional[str],
+        behavior: Optional[str],
+        update: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[int]:
+        """Commit the answer to ``session``'s pending question, plus any extra ``update``."""
+
+        interview_id = session["_id"]
+        turn = int(session["turn_count"])
+        ops = {key: dict(value) for key, value in (update or {}).items()}
+        appended = False
+        if self.is_bucketed(session):
+            entry: Document = {
+                "turn": turn,
+                "question": session.get("current_question") or "",
+                "answer": answer,
+                "behavior": behavior,
+            }
+            appended = await self._append_turn(interview_id, entry)
+            guard: Document = {"status": {"$nin": list(CLOSED_STATUSES)}, "turn_count": turn}
+            if next_question:
+                ops.setdefault("$set", {})["current_question"] = next_question
+        else:
+            guard = {
+                "status": {"$nin": list(CLOSED_STATUSES)},
+                "$or": [
+                    {"turn_count": turn},
+                    {"turn_count": {"$exists": False}, "answers": {"$size": turn}},
+                ],
+            }
+            push = ops.setdefault("$push", {})
+            push["answers"] = answer
+            if next_question:
+                push["questions"] = next_question
+                push["behaviors"] = behavior
+        ops.setdefault("$set", {})["turn_count"] = turn + 1
+        committed = await self._durable_collection.find_one_and_update(
+            self._filter(interview_id, user_id, guard),
+            ops,
+            {"turn_count": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if committed is None:
+            return None
+        if self.is_bucketed(session) and not appended:
+            # A failed attempt or a losing racer stored this turn first; keep the answer that won.
+            await self._durable_turns.update_one(
+                {"interview_id": interview_id, "bucket": turn // TURNS_PER_BUCKET},
+                {"$set": {"turns.$[entry]": entry}},
+                array_filters=[{"entry.turn": turn}],
+            )
+        return committed["turn_count"]
+
+    async def _append_turn(self, interview_id: ObjectId, entry: Mapping[str, Any]) -> bool:
+        """Push ``entry`` into its bucket unless that turn is already stored; True if pushed."""
+
+        try:
+            result = await self._durable_turns.update_one(
+                {
+                    "interview_id": interview_id,
+                    "bucket": entry["turn"] // TURNS_PER_BUCKET,
+                    "turns.turn": {"$ne": entry["turn"]},
+                },
+                {"$push": {"turns": dict(entry)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # The bucket exists and already holds this turn, so the upsert tried to insert.
+            return False
+        return result.modified_count > 0 or result.upserted_id is not None
+
+    async def update(
+        self,
+        interview_id: ObjectId,
+        update: Mapping[str, Any],
+        user_id: Optional[str] = None,
+        conditions: Optional[Mapping[str, Any]] = None,
+    ) -> bool:
+        """Apply ``update``; ``conditions`` make it a compare-and-set. True if a document matched."""
+
+        result = await self.collection.update_one(self._filter(interview_id, user_id, conditions), update)
+        return result.matched_count > 0
+
+    async def complete(
+        self,
+        interview_id: ObjectId,
+        user_id: str,
+        projection: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Document]:
+        """Mark the session completed and return it as it was before the update."""
+
+        session = await self.collection.find_one_and_update(
+            self._filter(interview_id, user_id, {"status": {"$ne": "archived"}}),
+            {"$set": {"status": "completed"}},
+            projection,
+            return_document=ReturnDocument.BEFORE,
+        )
+        return session if session is not None else await self.get(interview_id, user_id, projection)
+
+    async def set_feedback(
+        self,
+        interview_id: ObjectId,
+        feedback: str,
+        feedback_status: str,
+        verdict: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        fields: Document = {"feedback": feedback, "feedback_status": feedback_status}
+        if verdict is not None:
+            fields["verdict"] = dict(verdict)
+        await self.update(interview_id, {"$set": fields})
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: int,
+        before: Optional[ObjectId] = None,
+        statuses: Sequence[str] = INTERVIEW_STATUSES,
+    ) -> List[Document]:
+        """One page of a user's sessions, newest first, without transcripts or notes."""
+
+        match: Document = {"user_id": user_id, "status": {"$in": list(statuses)}}
+        if before is not None:
+            match["_id"] = {"$lt": before}
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"_id": -1}},
+            {"$limit": limit},
+            {
+                "$project": {
+                    "domain": 1,
+                    "experience": 1,
+                    "status": 1,
+                    "feedback_status": 1,
+                    "verdict": 1,
+                    "turns": _TURNS_EXPRESSION,
+                }
+            },
+        ]
+        return await self.collection.aggregate(pipeline).to_list(limit)
+
+    async def stats_for_user(self, user_id: str) -> Document:
+        """Sessions per domain, average turns, and verdict distribution in one aggregation."""
+
+        pipeline = [
+            {"$match": {"user_id": user_id, "status": {"$in": list(INTERVIEW_STATUSES)}}},
+            {
+                "$project": {
+                    "domain": 1,
+                    "status": 1,
+                    "turns": _TURNS_EXPRESSION,
+                    "score": "$verdict.score",
+                    "verdict": {"$ifNull": ["$verdict.label", "Unrated"]},
+                }
+            },
+            {
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "sessions": {"$sum": 1},
+                                "completed": {
+                                    "$sum": {"$cond": [{"$in": ["$status", list(CLOSED_STATUSES)]}, 1, 0]}
+                                },
+                                "average_turns": {"$avg": "$turns"},
+                                "average_score": {"$avg": "$score"},
+                            }
+                        }
+                    ],
+                    "domains": [
+                        {
+                            "$group": {
+                                "_id": "$domain",
+                                "sessions": {"$sum": 1},
+                                "average_turns": {"$avg": "$turns"},
+                                "average_score": {"$avg": "$score"},
+                            }
+                        },
+                        {"$sort": {"sessions": -1, "_id": 1}},
+                    ],
+                    "verdicts": [
+                        {"$match": {"status": {"$in": list(CLOSED_STATUSES)}}},
+                        {"$group": {"_id": "$verdict", "count": {"$sum": 1}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                    ],
+                }
+            },
+        ]
+        results = await self.collection.aggregate(pipeline).to_list(1)
+        return results[0] if results else {"totals": [], "domains": [], "verdicts": []}
+
+    async def archive_candidates(self, started_before: datetime, limit: int) -> List[ObjectId]:
+        """Completed sessions started before ``started_before`` whose evaluation has settled."""
+
+        cursor = (
+            self.collection.find(
+                {
+                    "status": "completed",
+                    "_id": {"$lt": ObjectId.from_datetime(started_before)},
+                    "feedback_status": {"$nin": ["pending", "failed"]},
+                },
+                {"_id": 1},
+            )
+            .sort("_id", 1)
+            .limit(limit)
+        )
+        return [doc["_id"] async for doc in cursor]
+
+    async def archive(self, interview_id: ObjectId, codec: str) -> Optional[Tuple[int, int]]:
+        """Move a completed session into ``interview_archive`` and leave a stub behind."""
+
+        session = await self.collection.find_one({"_id": interview_id, "status": "completed"})
+        if session is None:
+            return None
+        turns: List[Document] = []
+        if self.is_bucketed(session):
+            turns = await self._bucket_turns(interview_id, 0, int(session.get("turn_count") or 0))
+        payload, raw_bytes = compress_document({"session": session, "turns": turns}, codec)
+        now = datetime.now(timezone.utc)
+        await self._durable_archive.replace_one(
+            {"_id": interview_id},
+            {
+                "user_id": session.get("user_id"),
+                "codec": codec,
+                "payload": Binary(payload),
+                "raw_bytes": raw_bytes,
+                "stored_bytes": len(payload),
+                "archived_at": now,
+            },
+            upsert=True,
+        )
+        turn_count = session.get("turn_count")
+        stub: Document = {
+            "$set": {
+                "status": "archived",
+                "archived_at": now,
+                "turn_count": len(session.get("answers") or []) if turn_count is None else turn_count,
+            }
+        }
+        dropped = {field: "" for field in session if field != "_id" and field not in _STUB_FIELDS}
+        if dropped:
+            stub["$unset"] = dropped
+        result = await self._durable_collection.update_one(
+            {"_id": interview_id, "status": "completed", "feedback_status": session.get("feedback_status")},
+            stub,
+        )
+        if result.matched_count == 0:
+            return None
+        await self.turns_collection.delete_many({"interview_id": interview_id})
+        return raw_bytes, len(payload)
+
+    @staticmethod
+    def unpack_archive(archived: Mapping[str, Any]) -> Tuple[Document, List[Document]]:
+        """Decompress an ``interview_archive`` document into the session header and its turns."""
+
+        document = decompress_document(archived["payload"], archived["codec"])
+        session = document["session"]
+        session["status"] = "archived"
+        return session, document.get("turns") or []
+
+    async def get_archived(self, interview_id: ObjectId, user_id: Optional[str] = None) -> Optional[Document]:
+        """Rehydrate an archived session, with every turn, in the inline array shape."""
+
+        archived = await self.archive_collection.find_one(self._filter(interview_id, user_id))
+        if archived is None:
+            return None
+        session, turns = self.unpack_archive(archived)
+        if self.is_bucketed(session):
+            self._attach_turns(session, turns)
+        return session
+
+    async def add_turn_note(self, interview_id: ObjectId, note: Mapping[str, Any]) -> None:
+        """Push a per-turn note unless that turn is already scored."""
+
+        await self.update(
+            interview_id,
+            {"$push": {"turn_notes": dict(note)}},
+            conditions={"turn_notes.turn": {"$ne": note["turn"]}},
+        )
+
+
+def get_users_repository() -> Optional[UserRepository]:
+    collection = get_users_collection()
+    if collection is None:
+        return None
+    return UserRepository(collection)
+
+
+def _turn_write_concern() -> WriteConcern:
+    value = settings.mongo_turn_write_concern.strip()
+    return WriteConcern(w=int(value) if value.isdigit() else value or "majority", j=True)
+
+
+def get_interviews_repository() -> Optional[InterviewRepository]:
+    collection = get_interviews_collection()
+    turns_collection = get_interview_turns_collection()
+    archive_collection = get_interview_archive_collection()
+    if collection is None or turns_collection is None or archive_collection is None:
+        return None
+    return InterviewRepository(collection, turns_collection, archive_collection, _turn_write_concern())
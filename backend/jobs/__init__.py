@@ -0,0 +1,4 @@
+from .archival import ArchivalJob, archival_job
+from .evaluation import EvaluationJobQueue, evaluation_jobs
+
+__all__ = ["ArchivalJob", "archival_job", "EvaluationJobQueue", "evaluation_jobs"]
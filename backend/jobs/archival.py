@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from config import settings
+from db import get_evaluation_jobs_collection, get_interviews_repository
+from db.archive import archive_codec
+
+from .evaluation import JOB_DONE, JOB_FAILED
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ArchivalJob:
+    """Periodically moves completed interviews older than ``after_days`` to cold storage."""
+
+    def __init__(self, after_days: float, interval_seconds: float, batch_size: int):
+        self.after_days = after_days
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self.archived = 0
+        self.failed = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.last_run: Optional[datetime] = None
+
+    async def run_once(self) -> int:
+        """Archive everything currently eligible; returns how many sessions moved."""
+
+        interviews = get_interviews_repository()
+        jobs = get_evaluation_jobs_collection()
+        if interviews is None or jobs is None:
+            return 0
+        codec = archive_codec()
+        started_before = _now() - timedelta(days=self.after_days)
+        moved = 0
+        skipped: List[ObjectId] = []
+        while True:
+            batch = await interviews.archive_candidates(started_before, self.batch_size + len(skipped))
+            candidates = [interview_id for interview_id in batch if interview_id not in skipped]
+            if not candidates:
+                break
+            for interview_id in candidates:
+                try:
+                    sizes = await interviews.archive(interview_id, codec)
+                except Exception as exc:
+                    logger.warning("Archiving interview %s failed: %s", interview_id, exc)
+                    self.failed += 1
+                    sizes = None
+                if sizes is None:
+                    # Changed under us or failed; leave it for the next pass.
+                    skipped.append(interview_id)
+                    continue
+                await jobs.delete_one({"_id": interview_id, "status": {"$in": [JOB_DONE, JOB_FAILED]}})
+                moved += 1
+                self.archived += 1
+                self.raw_bytes += sizes[0]
+                self.stored_bytes += sizes[1]
+        self.last_run = _now()
+        if moved:
+            logger.info("Archived %s completed interviews (%s)", moved, codec)
+        return moved
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                logger.warning("Interview archival pass failed: %s", exc)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "archived": self.archived,
+            "failed": self.failed,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else None,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
+
+
+archival_job = ArchivalJob(
+    after_days=settings.archive_after_days,
+    interval_seconds=settings.archive_interval_seconds,
+    batch_size=settings.archive_batch_size,
+)
+
+
+# ``python -m jobs.archival`` from backend/: run one archival pass now and print the counters.
+if __name__ == "__main__":
+    asyncio.run(archival_job.run_once())
+    print(json.dumps(archival_job.stats(), indent=2))
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from config import settings
+from db import get_evaluation_jobs_collection, get_interviews_repository
+from llm import evaluate_interview, history_from_session, parse_verdict
+from llm.evaluator import FALLBACK_FEEDBACK
+
+SWEEP_INTERVAL_SECONDS = 30
+RUNNING_LEASE_SECONDS = 120
+# The owner of a running job refreshes its lease this often, well inside the expiry.
+LEASE_RENEW_SECONDS = RUNNING_LEASE_SECONDS / 4
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class EvaluationJobQueue:
+    """In-process asyncio worker pool over a Mongo-persisted evaluation job queue."""
+
+    def __init__(self, workers: int, max_attempts: int, stream_grace_seconds: float = 0.0):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.stream_grace_seconds = stream_grace_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+
+    async def enqueue(self, interview_object_id: ObjectId, user_id: str) -> None:
+        jobs = get_evaluation_jobs_collection()
+        if jobs is None:
+            raise RuntimeError("Database not configured")
+        now = _now()
+        available_at = now + timedelta(seconds=self.stream_grace_seconds)
+        # A job that ran out of attempts is reset so the client can ask for a retry.
+        await jobs.update_one(
+            {"_id": interview_object_id, "status": JOB_FAILED},
+            {
+                "$set": {"status": JOB_QUEUED, "attempts": 0, "available_at": available_at, "updated_at": now},
+                "$unset": {"error": ""},
+            },
+        )
+        await jobs.update_one(
+            {"_id": interview_object_id},
+            {
+                "$setOnInsert": {
+                    "user_id": user_id,
+                    "status": JOB_QUEUED,
+                    "attempts": 0,
+                    "available_at": available_at,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            },
+            upsert=True,
+        )
+        if self._queue is not None:
+            asyncio.get_running_loop().call_later(
+                self.stream_grace_seconds, self._queue.put_nowait, interview_object_id
+            )
+
+    async def wait(self, interview_id: str, timeout: float) -> None:
+        """Block until this process finishes the job or ``timeout`` passes."""
+
+        event = asyncio.Event()
+        self._waiters.setdefault(interview_id, set()).add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(interview_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[interview_id]
+
+    def _notify(self, interview_id: str) -> None:
+        for event in self._waiters.pop(interview_id, ()):
+            event.set()
+
+    async def claim(
+        self, interview_object_id: ObjectId, respect_grace: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically move a queued job to running; None if someone else owns it."""
+
+        jobs = get_evaluation_jobs_collection()
+        if jobs is None:
+            return None
+        query: Dict[str, Any] = {"_id": interview_object_id, "status": JOB_QUEUED}
+        if respect_grace:
+            query["$or"] = [{"available_at": {"$exists": False}}, {"available_at": {"$lte": _now()}}]
+        return await jobs.find_one_and_update(
+            query,
+            {"$set": {"status": JOB_RUNNING, "updated_at": _now()}, "$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def _owned(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter matching ``job`` only while this claim still holds it."""
+
+        return {"_id": job["_id"], "status": JOB_RUNNING, "attempts": job["attempts"]}
+
+    async def renew(self, job: Dict[str, Any]) -> bool:
+        """Push the lease of a claimed job forward; False once the claim was lost."""
+
+        jobs = get_evaluation_jobs_collection()
+        if jobs is None:
+            return False
+        result = await jobs.update_one(self._owned(job), {"$set": {"updated_at": _now()}})
+        return result.matched_count > 0
+
+    @asynccontextmanager
+    async def lease(self, job: Dict[str, Any]) -> AsyncIterator[None]:
+        """Keep renewing ``job``'s lease while the body runs, so the sweep leaves it alone."""
+
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(LEASE_RENEW_SECONDS)
+                try:
+                    if not await self.renew(job):
+                        logger.warning("Evaluation job %s lost its lease", job["_id"])
+                        return
+                except Exception as exc:
+                    logger.warning("Could not renew the lease of evaluation job %s: %s", job["_id"], exc)
+
+        task = asyncio.get_running_loop().create_task(heartbeat())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        jobs = get_evaluation_jobs_collection()
+        interviews = get_interviews_repository()
+        if jobs is None or interviews is None:
+            return
+        interview_object_id = job["_id"]
+        try:
+            session = await interviews.get_transcript(interview_object_id)
+            if session is None:
+                await jobs.update_one(
+                    self._owned(job),
+                    {"$set": {"status": JOB_FAILED, "error": "Interview not found", "updated_at": _now()}},
+                )
+                return
+            async with self.lease(job):
+                feedback = await evaluate_interview(
+                    history_from_session(session),
+                    session.get("domain", ""),
+                    session.get("experience", ""),
+                    turn_notes=session.get("turn_notes"),
+                )
+            if feedback == FALLBACK_FEEDBACK:
+                raise RuntimeError("Evaluator returned fallback feedback")
+            await self.complete(job, feedback)
+        except Exception as exc:
+            retry = job.get("attempts", 1) < self.max_attempts
+            logger.warning(
+                "Evaluation job %s failed (attempt %s): %s", interview_object_id, job.get("attempts"), exc
+            )
+            result = await jobs.update_one(
+                self._owned(job),
+                {
+                    "$set": {
+                        "status": JOB_QUEUED if retry else JOB_FAILED,
+                        "error": str(exc),
+                        "updated_at": _now(),
+                    }
+                },
+            )
+            if result.matched_count == 0:
+                # The lease expired and another attempt owns (or finished) the job now.
+                return
+            if retry and self._queue is not None:
+                self._queue.put_nowait(interview_object_id)
+            elif not retry:
+                await interviews.set_feedback(interview_object_id, FALLBACK_FEEDBACK, "failed")
+        finally:
+            self._notify(str(interview_object_id))
+
+    async def complete(self, job: Dict[str, Any], feedback: str) -> bool:
+        """Store the finished feedback and close the job; False if the claim was lost first."""
+
+        jobs = get_evaluation_jobs_collection()
+        interviews = get_interviews_repository()
+        if jobs is None or interviews is None:
+            raise RuntimeError("Database not configured")
+        # Renewing first leaves a full lease for the two writes below.
+        if not await self.renew(job):
+            logger.warning("Dropping feedback for evaluation job %s: claim lost", job["_id"])
+            return False
+        await interviews.set_feedback(job["_id"], feedback, "ready", parse_verdict(feedback))
+        await jobs.update_one(
+            self._owned(job),
+            {"$set": {"status": JOB_DONE, "updated_at": _now()}, "$unset": {"error": ""}},
+        )
+        self._notify(str(job["_id"]))
+        return True
+
+    async def release(self, job: Dict[str, Any]) -> None:
+        """Hand a claimed job back to the workers without counting an attempt."""
+
+        jobs = get_evaluation_jobs_collection()
+        if jobs is None:
+            return
+        result = await jobs.update_one(
+            self._owned(job),
+            {"$set": {"status": JOB_QUEUED, "updated_at": _now()}, "$inc": {"attempts": -1}},
+        )
+        if result.matched_count and self._queue is not None:
+            self._queue.put_nowait(job["_id"])
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            interview_object_id = await self._queue.get()
+            try:
+                job = await self.claim(interview_object_id, respect_grace=True)
+                if job is not None:
+                    await self._run_job(job)
+            except Exception as exc:
+                logger.exception("Evaluation worker error for %s: %s", interview_object_id, exc)
+            finally:
+                self._queue.task_done()
+
+    async def _sweep(self) -> None:
+        """Re-queue jobs abandoned by dead workers and pick up anything still queued."""
+
+        jobs = get_evaluation_jobs_collection()
+        if jobs is None or self._queue is None:
+            return
+        stale_before = _now() - timedelta(seconds=RUNNING_LEASE_SECONDS)
+        await jobs.update_many(
+            {"status": JOB_RUNNING, "updated_at": {"$lt": stale_before}},
+            {"$set": {"status": JOB_QUEUED, "updated_at": _now()}},
+        )
+        async for doc in jobs.find({"status": JOB_QUEUED}, {"_id": 1}):
+            self._queue.put_nowait(doc["_id"])
+
+    async def _sweeper(self) -> None:
+        while True:
+            try:
+                await self._sweep()
+            except Exception as exc:
+                logger.warning("Evaluation job sweep failed: %s", exc)
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._sweeper()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+
+evaluation_jobs = EvaluationJobQueue(
+    workers=settings.evaluation_workers,
+    max_attempts=settings.evaluation_max_attempts,
+    stream_grace_seconds=settings.evaluation_stream_grace_seconds,
+)
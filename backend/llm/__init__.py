@@ -1,4 +1,11 @@
-from .evaluator import evaluate_interview
-from .interviewer import generate_interview_question
+from .evaluator import evaluate_interview, history_from_session, parse_verdict, stream_interview_evaluation
+from .interviewer import generate_interview_question, stream_interview_question
 
-__all__ = ["generate_interview_question", "evaluate_interview"]
+__all__ = [
+    "generate_interview_question",
+    "stream_interview_question",
+    "evaluate_interview",
+    "stream_interview_evaluation",
+    "history_from_session",
+    "parse_verdict",
+]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Literal, Optional, TypedDict
+
+from .similarity import content_words
+
+BehaviorCategory = Literal[
+    "Confused User",
+    "Efficient User",
+    "Chatty User",
+    "Edge-Case User",
+]
+DEFAULT_BEHAVIOR: BehaviorCategory = "Efficient User"
+
+SHORT_ANSWER_WORDS = 40
+LONG_ANSWER_WORDS = 140
+# Pattern checks only look at the start of very long answers to keep the cost bounded.
+MAX_SCAN_CHARS = 1200
+# At or below this, a label is reported but the turn is not treated as "simple" for
+# routing. A bare short answer ("Yes.") scores exactly this, so only an answer that
+# also engages the question's topic clears it.
+CONFIDENT_SCORE = 0.6
+
+_INJECTION_PATTERNS = re.compile(
+    r"ignore (all |any |the )?(previous|prior|above) (instructions|prompts?)"
+    r"|system prompt|developer mode|jailbreak|you are now|pretend (to be|you are)"
+    r"|act as (an? )?(ai|assistant|admin|root)|reveal (your|the) (prompt|instructions)"
+    r"|<\s*script|drop\s+table|;\s*--|rm\s+-rf|sudo\s",
+)
+_OFF_TOPIC_PATTERNS = re.compile(
+    r"\b(tell me a joke|weather|recipe|write (me )?(a|an) (poem|song|essay|story)"
+    r"|what('s| is) your (name|favou?rite)|are you (human|real|a bot)|play a game"
+    r"|lottery|bitcoin price|stock tips)\b",
+)
+_HEDGE_PATTERNS = re.compile(
+    r"\b(not sure|i don'?t know|idk|no idea|confus(ed|ing)|i guess|maybe|kind of|sort of"
+    r"|i think so|i'?m lost|what do you mean|can you (repeat|rephrase|clarify|explain)"
+    r"|could you (repeat|rephrase|clarify|explain)|which (one|part)|did you mean)\b",
+)
+_TANGENT_PATTERNS = re.compile(
+    r"\b(by the way|anyway|funny story|long story|fun fact|speaking of|that reminds me"
+    r"|off topic|side note|my (dog|cat|family|weekend|vacation|kids?))\b",
+)
+
+
+class BehaviorGuess(TypedDict):
+    behavior: BehaviorCategory
+    confidence: float
+    signals: List[str]
+
+
+def classify_answer(answer: Optional[str], question: Optional[str] = None) -> BehaviorGuess:
+    """Label an answer with a persona from cheap lexical signals, without calling the LLM."""
+
+    text = (answer or "").strip()
+    word_count = len(text.split())
+    lowered = text[:MAX_SCAN_CHARS].lower()
+    scores: Dict[str, float] = {
+        "Confused User": 0.0,
+        "Efficient User": 0.2,
+        "Chatty User": 0.0,
+        "Edge-Case User": 0.0,
+    }
+    signals: List[str] = []
+
+    if not text:
+        return {"behavior": "Confused User", "confidence": 0.5, "signals": ["empty answer"]}
+
+    if _INJECTION_PATTERNS.search(lowered):
+        scores["Edge-Case User"] += 1.0
+        signals.append("prompt-injection pattern")
+    if _OFF_TOPIC_PATTERNS.search(lowered):
+        scores["Edge-Case User"] += 0.7
+        signals.append("off-topic request")
+    letters = sum(map(str.isalpha, lowered))
+    if letters < len(lowered) * 0.5:
+        scores["Edge-Case User"] += 0.6
+        signals.append("mostly non-alphabetic")
+
+    hedges = len(_HEDGE_PATTERNS.findall(lowered))
+    questions = lowered.count("?")
+    if hedges:
+        scores["Confused User"] += min(0.8, 0.35 * hedges)
+        signals.append(f"{hedges} hedge phrase(s)")
+    if questions:
+        scores["Confused User"] += min(0.5, 0.25 * questions)
+        signals.append(f"{questions} question mark(s)")
+
+    tangents = len(_TANGENT_PATTERNS.findall(lowered))
+    if word_count >= LONG_ANSWER_WORDS:
+        scores["Chatty User"] += 0.6
+        signals.append(f"long answer ({word_count} words)")
+    if tangents:
+        scores["Chatty User"] += min(0.6, 0.3 * tangents)
+        signals.append(f"{tangents} tangent marker(s)")
+
+    question_words = set(content_words(question))
+    if question_words and word_count >= 5:
+        overlap = len(question_words & set(content_words(lowered))) / len(question_words)
+        if overlap == 0:
+            scores["Chatty User" if word_count >= SHORT_ANSWER_WORDS else "Edge-Case User"] += 0.3
+            signals.append("no overlap with the question")
+        elif overlap >= 0.3:
+            scores["Efficient User"] += 0.3
+            signals.append("on-topic")
+
+    if word_count <= SHORT_ANSWER_WORDS and not hedges and not questions:
+        scores["Efficient User"] += 0.4
+        signals.append(f"short direct answer ({word_count} words)")
+
+    behavior = max(scores, key=scores.get)
+    return {
+        "behavior": behavior,  # type: ignore[typeddict-item]
+        "confidence": round(min(1.0, scores[behavior]), 2),
+        "signals": signals,
+    }
+
+
+def is_simple_turn(guess: Optional[BehaviorGuess]) -> bool:
+    """True for confidently efficient, on-topic answers that a smaller model can handle."""
+
+    return (
+        guess is not None
+        and guess["behavior"] == "Efficient User"
+        and guess["confidence"] > CONFIDENT_SCORE
+    )
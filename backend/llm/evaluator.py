@@ -1,37 +1,66 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Iterable, List, Optional
-
-from groq import Groq
+import re
+from itertools import zip_longest
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, TypedDict
 
+from clients import get_groq_client
 from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded, get_breaker
+
+from .model_router import model_router
+from .prompt_budget import PromptSection, assemble_prompt, estimate_tokens
+from .response_cache import cache_key, cached_completion, response_cache
+from .turn_scorer import TurnNote, format_turn_notes, rubric_averages, score_turn
 
-DEFAULT_MODEL = "llama-3.1-8b-instant"
 FALLBACK_FEEDBACK = (
     "Interview feedback is temporarily unavailable. Please retry once the evaluator comes back online."
 )
 
-_client: Optional[Groq] = None
 logger = logging.getLogger(__name__)
 
+_VERDICT_SCORED = re.compile(
+    r"overall(?:\s+(?:verdict|rating|assessment))?\s*[:\-\u2013]\s*([a-z][a-z \-]{0,40}?)\s*\(\s*(\d+(?:\.\d+)?)\s*/\s*10\s*\)",
+    re.IGNORECASE,
+)
+_VERDICT_LABEL = re.compile(
+    r"overall(?:\s+(?:verdict|rating|assessment))?\s*[:\-\u2013]\s*([a-z][a-z \-]{0,40}?)\s*(?:[.,;\n]|$)",
+    re.IGNORECASE,
+)
+
 
-def _get_client() -> Optional[Groq]:
-    global _client
-    if _client is None and settings.groq_api_key:
-        _client = Groq(api_key=settings.groq_api_key)
-    return _client
+class Verdict(TypedDict):
+    label: str
+    score: Optional[float]
 
 
 EVALUATOR_SYSTEM_PROMPT = (
     "You are a bar-raising technical interviewer who delivers candid, detail-rich critiques. "
     "Call out weak or incomplete answers, note any risk areas for the role, and balance brief praise with actionable criticism."
 )
+EVALUATOR_SYSTEM_PROMPT_TOKENS = estimate_tokens(EVALUATOR_SYSTEM_PROMPT)
+EVALUATOR_PARAMS = {"temperature": 0.3, "max_tokens": 350}
+WINDOW_PARAMS = {"temperature": 0.2, "max_tokens": 160}
+
+WINDOW_SYSTEM_PROMPT = (
+    "You review one slice of a longer mock interview for a final evaluator. "
+    "Write terse plain-text notes on answer quality, technical gaps, communication, and anything notable. "
+    "Refer to questions by their number and do not give an overall verdict."
+)
+WINDOW_NOTES_LABEL = (
+    "The transcript was long, so reviewers critiqued it in consecutive slices. "
+    "Their notes follow, in interview order:\n"
+)
+TURN_NOTES_LABEL = "Each answer was scored against the rubric as the interview went on. Per-answer notes:\n"
+# Unscored turns beyond this (e.g. sessions from before per-turn scoring) use the transcript path.
+MAX_LATE_SCORED_TURNS = 3
 
 
-def _history_to_text(history: Iterable[dict[str, str]]) -> str:
+def _history_blocks(history: Iterable[dict[str, str]], start: int = 1) -> List[str]:
     lines: List[str] = []
-    for idx, turn in enumerate(history, start=1):
+    for idx, turn in enumerate(history, start=start):
         question = (turn.get("question") or "").strip()
         answer = (turn.get("answer") or "").strip()
         if not question and not answer:
@@ -39,50 +68,337 @@ def _history_to_text(history: Iterable[dict[str, str]]) -> str:
         question_text = question or "(question unavailable)"
         answer_text = answer or "(no answer provided)"
         lines.append(f"Question {idx}: {question_text}\nAnswer: {answer_text}")
+    return lines
+
+
+def _history_to_text(history: Iterable[dict[str, str]]) -> str:
+    lines = _history_blocks(history)
     return "\n\n".join(lines) if lines else "No interview responses were captured."
 
 
-def evaluate_interview(
+def parse_verdict(feedback: Optional[str]) -> Optional[Verdict]:
+    """Pull the "Overall: Needs Work (5/10)" line the evaluator prompt asks for."""
+
+    text = feedback or ""
+    match = _VERDICT_SCORED.search(text)
+    if match is not None:
+        return {"label": match.group(1).strip().title(), "score": float(match.group(2))}
+    match = _VERDICT_LABEL.search(text)
+    if match is None:
+        return None
+    return {"label": match.group(1).strip().title(), "score": None}
+
+
+def history_from_session(session: dict) -> List[dict[str, str]]:
+    """Pair recorded questions and answers for evaluation."""
+
+    recorded_questions = list(session.get("questions", []) or [])
+    recorded_answers = list(session.get("answers", []) or [])
+
+    # If the interviewer asked an extra question that never received an answer,
+    # drop it so the evaluator does not assume the candidate skipped it.
+    while recorded_questions and len(recorded_questions) > len(recorded_answers):
+        recorded_questions.pop()
+
+    return [
+        {"question": question or "", "answer": answer or ""}
+        for question, answer in zip_longest(
+            recorded_questions,
+            recorded_answers,
+            fillvalue="",
+        )
+    ]
+
+
+def _build_evaluation_message(
     history: Iterable[dict[str, str]],
     domain: str,
     experience: str,
+    notes: Optional[Sequence[str]] = None,
+    notes_label: str = WINDOW_NOTES_LABEL,
 ) -> str:
-    """Summarize the interview with structured, plain-text coaching feedback."""
+    if notes is None:
+        body = PromptSection(
+            "transcript",
+            _history_blocks(history),
+            trim_priority=1,
+            trim_from="start",
+            separator="\n\n",
+            suffix="\n\n",
+            empty_text="No interview responses were captured.",
+        )
+        transcript_label = "Conversation transcript:\n"
+    else:
+        body = PromptSection(
+            "notes",
+            notes,
+            trim_priority=1,
+            trim_from="start",
+            separator="\n\n",
+            suffix="\n\n",
+        )
+        transcript_label = notes_label
+    sections = [
+        PromptSection(
+            "context",
+            [
+                "Interview evaluation request.\n"
+                f"Target role / domain: {domain or 'Generalist'}\n"
+                f"Experience level: {experience or 'Unspecified'}\n\n"
+                f"{transcript_label}"
+            ],
+        ),
+        body,
+        PromptSection(
+            "instructions",
+            [
+                "Produce brief plain-text paragraphs (no bullet lists) that cover:\n"
+                "- Communication quality (note hesitations or fluff).\n"
+                "- Technical depth relative to the stated role; highlight any gaps or missing fundamentals.\n"
+                "- Observed confidence/executive presence plus listening skills.\n"
+                "- Structure & clarity of explanations, including any rambling or unanswered prompts.\n"
+                "- 3 pointed improvement actions (skills, preparation, delivery).\n"
+                "- Final summary verdict such as 'Overall: Needs Work (5/10)' with a short justification.\n"
+                "Adopt a stricter coaching tone: be professional but frank, emphasize shortcomings before strengths, and keep the response under ~180 words without markdown tables."
+            ],
+        ),
+    ]
+    user_message, _ = assemble_prompt(
+        sections,
+        settings.evaluator_input_token_budget,
+        "evaluator",
+        fixed_overhead=EVALUATOR_SYSTEM_PROMPT_TOKENS,
+    )
+    return user_message
 
-    client = _get_client()
-    if client is None:
-        logger.warning("Groq client not configured; returning fallback feedback")
-        return FALLBACK_FEEDBACK
 
-    history_text = _history_to_text(history)
+async def _critique_window(
+    client,
+    blocks: List[str],
+    first_question: int,
+    domain: str,
+    experience: str,
+    semaphore: asyncio.Semaphore,
+) -> str:
+    """Map step: notes on one window of turns, or its raw transcript if the call fails."""
+
+    last_question = first_question + len(blocks) - 1
+    transcript = "\n\n".join(blocks)
     user_message = (
-        "Interview evaluation request.\n"
         f"Target role / domain: {domain or 'Generalist'}\n"
         f"Experience level: {experience or 'Unspecified'}\n\n"
-        "Conversation transcript:\n"
-        f"{history_text}\n\n"
-        "Produce brief plain-text paragraphs (no bullet lists) that cover:\n"
-        "- Communication quality (note hesitations or fluff).\n"
-        "- Technical depth relative to the stated role; highlight any gaps or missing fundamentals.\n"
-        "- Observed confidence/executive presence plus listening skills.\n"
-        "- Structure & clarity of explanations, including any rambling or unanswered prompts.\n"
-        "- 3 pointed improvement actions (skills, preparation, delivery).\n"
-        "- Final summary verdict such as 'Overall: Needs Work (5/10)' with a short justification.\n"
-        "Adopt a stricter coaching tone: be professional but frank, emphasize shortcomings before strengths, and keep the response under ~180 words without markdown tables."
+        f"Questions {first_question}-{last_question}:\n{transcript}\n\n"
+        "Return at most 80 words of notes."
     )
+    model = model_router.select("evaluator.window")
+
+    async def produce() -> str:
+        async with semaphore:
+            response = await model_router.call(
+                model,
+                lambda timeout: client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": WINDOW_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_message},
+                    ],
+                    timeout=timeout,
+                    **WINDOW_PARAMS,
+                ),
+                settings.llm_timeout_seconds,
+            )
+        return (response.choices[0].message.content or "").strip()
 
     try:
-        response = client.chat.completions.create(
-            model=settings.groq_model or DEFAULT_MODEL,
-            messages=[
-                {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=0.3,
-            max_tokens=350,
+        notes = await cached_completion(
+            "evaluator_window",
+            cache_key(model, WINDOW_SYSTEM_PROMPT, user_message, **WINDOW_PARAMS),
+            produce,
+        )
+    except (CircuitOpenError, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        logger.warning("Window critique for questions %s-%s failed: %s", first_question, last_question, exc)
+        notes = ""
+    if not notes:
+        return f"Questions {first_question}-{last_question} (raw transcript):\n{transcript}"
+    return f"Questions {first_question}-{last_question}:\n{notes}"
+
+
+async def _prepare_evaluation_message(
+    client,
+    history: Iterable[dict[str, str]],
+    domain: str,
+    experience: str,
+    turn_notes: Optional[Sequence[TurnNote]] = None,
+) -> str:
+    """Build the evaluator prompt, critiquing long transcripts window by window first."""
+
+    turns = list(history)
+    if turn_notes:
+        message = await _turn_notes_message(turns, domain, experience, turn_notes)
+        if message is not None:
+            return message
+
+    blocks = _history_blocks(turns)
+    if estimate_tokens("\n\n".join(blocks)) <= settings.evaluator_chunk_threshold_tokens:
+        return _build_evaluation_message(turns, domain, experience)
+
+    window = max(1, settings.evaluator_chunk_turns)
+    semaphore = asyncio.Semaphore(max(1, settings.evaluator_map_concurrency))
+    windows = [
+        _history_blocks(turns[offset : offset + window], start=offset + 1)
+        for offset in range(0, len(turns), window)
+    ]
+    notes = await asyncio.gather(
+        *(
+            _critique_window(client, blocks, idx * window + 1, domain, experience, semaphore)
+            for idx, blocks in enumerate(windows)
+            if blocks
+        )
+    )
+    return _build_evaluation_message(turns, domain, experience, notes=notes)
+
+
+async def _turn_notes_message(
+    turns: List[dict[str, str]],
+    domain: str,
+    experience: str,
+    turn_notes: Sequence[TurnNote],
+) -> Optional[str]:
+    """Reduce-only prompt from per-turn notes; None when too many turns lack notes."""
+
+    answered = [
+        idx for idx, turn in enumerate(turns) if (turn.get("question") or turn.get("answer") or "").strip()
+    ]
+    notes_by_turn = {note["turn"]: note for note in turn_notes if note.get("turn") in answered}
+    missing = [idx for idx in answered if idx not in notes_by_turn]
+    if not answered or len(missing) > MAX_LATE_SCORED_TURNS:
+        return None
+
+    late_notes = await asyncio.gather(
+        *(
+            score_turn(idx, turns[idx].get("question", ""), turns[idx].get("answer", ""), domain, experience)
+            for idx in missing
+        )
+    )
+    unscored: List[str] = []
+    for idx, note in zip(missing, late_notes):
+        if note is not None:
+            notes_by_turn[idx] = note
+        else:
+            unscored.extend(_history_blocks(turns[idx : idx + 1], start=idx + 1))
+
+    label = TURN_NOTES_LABEL
+    averages = rubric_averages(notes_by_turn.values())
+    if averages:
+        label = f"{averages}\n\n{label}"
+    lines = format_turn_notes(notes_by_turn.values())
+    if unscored:
+        lines.append("Answers that could not be scored (raw transcript):\n" + "\n\n".join(unscored))
+    return _build_evaluation_message(turns, domain, experience, notes=lines, notes_label=label)
+
+
+async def evaluate_interview(
+    history: Iterable[dict[str, str]],
+    domain: str,
+    experience: str,
+    turn_notes: Optional[Sequence[TurnNote]] = None,
+) -> str:
+    """Summarize the interview with structured, plain-text coaching feedback."""
+
+    client = get_groq_client()
+    if client is None:
+        logger.warning("Groq client not configured; returning fallback feedback")
+        return FALLBACK_FEEDBACK
+
+    try:
+        user_message = await _prepare_evaluation_message(
+            client, history, domain, experience, turn_notes
+        )
+        model = model_router.select("evaluator")
+
+        async def produce() -> str:
+            response = await model_router.call(
+                model,
+                lambda timeout: client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_message},
+                    ],
+                    timeout=timeout,
+                    **EVALUATOR_PARAMS,
+                ),
+                settings.llm_timeout_seconds,
+            )
+            return (response.choices[0].message.content or "").strip()
+
+        content = await cached_completion(
+            "evaluator",
+            cache_key(model, EVALUATOR_SYSTEM_PROMPT, user_message, **EVALUATOR_PARAMS),
+            produce,
         )
-        content = response.choices[0].message.content.strip()
         return content or FALLBACK_FEEDBACK
+    except (CircuitOpenError, DeadlineExceeded) as exc:
+        logger.warning("Skipping evaluation: %s", exc)
+        return FALLBACK_FEEDBACK
     except Exception as exc:
         logger.exception("Groq evaluation failed: %s", exc)
         return FALLBACK_FEEDBACK
+
+
+async def stream_interview_evaluation(
+    history: Iterable[dict[str, str]],
+    domain: str,
+    experience: str,
+    turn_notes: Optional[Sequence[TurnNote]] = None,
+) -> AsyncIterator[str]:
+    """Yield evaluator feedback text as it is generated."""
+
+    client = get_groq_client()
+    if client is None:
+        raise RuntimeError("Groq client not configured")
+
+    user_message = await _prepare_evaluation_message(
+        client, history, domain, experience, turn_notes
+    )
+    model = model_router.select("evaluator")
+    key = cache_key(model, EVALUATOR_SYSTEM_PROMPT, user_message, **EVALUATOR_PARAMS)
+    cacheable = response_cache.enabled_for("evaluator")
+    if cacheable:
+        cached = await response_cache.get("evaluator", key)
+        if cached is not None:
+            yield cached
+            return
+
+    stream = await model_router.call(
+        model,
+        lambda timeout: client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message},
+            ],
+            stream=True,
+            timeout=timeout,
+            **EVALUATOR_PARAMS,
+        ),
+        settings.llm_timeout_seconds,
+    )
+    parts: List[str] = []
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception:
+        get_breaker(model).record_failure()
+        model_router.record(model, 0.0, ok=False)
+        raise
+    content = "".join(parts).strip()
+    if cacheable and content:
+        await response_cache.set("evaluator", key, content)
@@ -1,25 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import secrets
-from typing import Iterable, List, Optional, TypedDict, Literal
+from typing import AsyncIterator, Iterable, List, Optional, TypedDict, Literal
 
-from groq import Groq
+from groq import AsyncGroq
 
+from clients import get_groq_client
 from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded, get_breaker
+
+from .behavior_classifier import (
+    DEFAULT_BEHAVIOR,
+    BehaviorCategory,
+    BehaviorGuess,
+    classify_answer,
+    is_simple_turn,
+)
+from .model_router import model_router
+from .question_bank import question_bank
+from .prompt_budget import PromptSection, assemble_prompt, estimate_tokens, split_words
+from .response_cache import cache_key, cached_completion, response_cache
+from .similarity import QuestionIndex
+from .streaming import IncrementalJSONFieldExtractor
 
-DEFAULT_MODEL = "llama-3.1-8b-instant"
 FALLBACK_QUESTION = "Could you walk me through a project you're proud of?"
 MAX_GENERATION_ATTEMPTS = 3
 MAX_HISTORY_TURNS = 6
 MAX_ASKED_TRACK = 12
-BehaviorCategory = Literal[
-    "Confused User",
-    "Efficient User",
-    "Chatty User",
-    "Edge-Case User",
-]
 
 
 class QuestionResult(TypedDict):
@@ -27,17 +38,14 @@ class QuestionResult(TypedDict):
     behavior: BehaviorCategory
 
 
-DEFAULT_BEHAVIOR: BehaviorCategory = "Efficient User"
-
-_client: Optional[Groq] = None
-logger = logging.getLogger(__name__)
+class QuestionStreamEvent(TypedDict, total=False):
+    event: Literal["behavior", "token", "done"]
+    text: str
+    question: str
+    behavior: BehaviorCategory
 
 
-def _get_client() -> Optional[Groq]:
-    global _client
-    if _client is None and settings.groq_api_key:
-        _client = Groq(api_key=settings.groq_api_key)
-    return _client
+logger = logging.getLogger(__name__)
 
 
 SYSTEM_PROMPT = (
@@ -56,6 +64,8 @@ SYSTEM_PROMPT = (
     " Never repeat a previous question verbatim, and whenever the session stage is 'opening' you must greet the candidate by name, mention the role, and set expectations before asking anything else."
     " Respond ONLY with valid JSON shaped like {\"behavior\": \"<category>\", \"question\": \"<next question>\"}."
 )
+SYSTEM_PROMPT_TOKENS = estimate_tokens(SYSTEM_PROMPT)
+INTERVIEWER_PARAMS = {"temperature": 0.55, "max_tokens": 220}
 
 
 BEHAVIOR_ALIASES: dict[str, BehaviorCategory] = {
@@ -76,7 +86,7 @@ BEHAVIOR_ALIASES: dict[str, BehaviorCategory] = {
 }
 
 
-def _history_to_text(history: Iterable[dict[str, str]]) -> str:
+def _history_blocks(history: Iterable[dict[str, str]]) -> List[str]:
     lines: List[str] = []
     for turn in history:
         question = turn.get("question", "").strip()
@@ -85,6 +95,11 @@ def _history_to_text(history: Iterable[dict[str, str]]) -> str:
             continue
         answer_text = answer or "(no answer provided)"
         lines.append(f"Q: {question}\nA: {answer_text}")
+    return lines
+
+
+def _history_to_text(history: Iterable[dict[str, str]]) -> str:
+    lines = _history_blocks(history)
     return "\n\n".join(lines) if lines else "No prior questions."
 
 
@@ -110,10 +125,12 @@ def _attempt_json_load(payload: str) -> dict:
     return {}
 
 
-def _parse_question_result(content: str) -> QuestionResult:
+def _parse_question_result(
+    content: str, default_behavior: BehaviorCategory = DEFAULT_BEHAVIOR
+) -> QuestionResult:
     data = _attempt_json_load(content)
     question = (data.get("question") or "").strip()
-    behavior = _normalize_behavior_label(data.get("behavior")) or DEFAULT_BEHAVIOR
+    behavior = _normalize_behavior_label(data.get("behavior")) or default_behavior
     if not question:
         question = FALLBACK_QUESTION
     return {
@@ -122,103 +139,242 @@ def _parse_question_result(content: str) -> QuestionResult:
     }
 
 
-def _should_retry(question: str, asked_questions: List[str]) -> bool:
+def _should_retry(question: str, question_index: QuestionIndex) -> bool:
     normalized = (question or "").strip()
     if not normalized:
         return True
     if normalized == FALLBACK_QUESTION:
         return True
-    if normalized in asked_questions:
+    if question_index.is_near_duplicate(normalized):
         return True
     return False
 
 
-def generate_interview_question(
-    history: Iterable[dict[str, str]],
+def _local_behavior(turns: List[dict[str, str]]) -> Optional[BehaviorGuess]:
+    """Heuristic label for the latest answer; None before the first answer."""
+
+    if not turns:
+        return None
+    return classify_answer(turns[-1].get("answer"), turns[-1].get("question"))
+
+
+def _interviewer_route(turns: List[dict[str, str]], local_behavior: Optional[BehaviorGuess]) -> str:
+    """Follow-ups to simple (confidently efficient) answers get the fast tier."""
+
+    if not turns:
+        return "interviewer.opening"
+    if is_simple_turn(local_behavior):
+        return "interviewer.follow_up"
+    return "interviewer.escalated"
+
+
+def _offline_question(
+    turns: List[dict[str, str]],
     domain: str,
     experience: str,
-    behavior_override: Optional[str] = None,
-    resume_context: Optional[str] = None,
-    candidate_name: Optional[str] = None,
+    resume_context: Optional[str],
+    candidate_name: Optional[str],
+    question_index: QuestionIndex,
+    behavior: BehaviorCategory,
 ) -> QuestionResult:
-    """Return the next interview question and detected behavior."""
+    """Question from the local bank, matched to the latest answer and resume, for LLM outages."""
 
-    turns = list(history)[-MAX_HISTORY_TURNS:]
-    client = _get_client()
-    normalized_override = _normalize_behavior_label(behavior_override)
-    session_stage = "opening" if not turns else "follow-up"
-    asked_questions = [
+    query = " ".join(part for part in ((turns[-1].get("answer") if turns else ""), resume_context) if part)
+    question = question_bank.search(domain, experience, query, question_index)
+    if question is None:
+        question = FALLBACK_QUESTION
+    elif not turns:
+        name = (candidate_name or "").strip()
+        greeting = f"Hi {name}, welcome" if name else "Welcome"
+        question = (
+            f"{greeting} to this {domain or 'practice'} interview. We'll go one question at a time. {question}"
+        )
+    else:
+        question = f"Thanks for that. {question}"
+    return {"question": question, "behavior": behavior}
+
+
+def _asked_questions(turns: List[dict[str, str]]) -> List[str]:
+    return [
         (turn.get("question") or "").strip()
         for turn in turns
         if (turn.get("question") or "").strip()
     ][-MAX_ASKED_TRACK:]
-    asked_block = "\n".join(f"- {question}" for question in asked_questions) or "- None yet"
-    variation_token = secrets.token_hex(3)
 
-    if client is None:
-        logger.warning("Groq client not configured; returning fallback question")
-        return {
-            "question": FALLBACK_QUESTION,
-            "behavior": normalized_override or DEFAULT_BEHAVIOR,
-        }
-
-    history_text = _history_to_text(turns)
-    resume_block = (
-        "Resume highlights:\n"
-        f"{resume_context}\n\n"
-        if resume_context
-        else ""
-    )
+
+def _build_user_message(
+    turns: List[dict[str, str]],
+    domain: str,
+    experience: str,
+    asked_questions: List[str],
+    normalized_override: Optional[BehaviorCategory],
+    resume_context: Optional[str],
+    candidate_name: Optional[str],
+    session_summary: Optional[str] = None,
+    local_behavior: Optional[BehaviorGuess] = None,
+) -> str:
+    session_stage = "opening" if not turns else "follow-up"
+    asked_block = "\n".join(f"- {question}" for question in asked_questions) or "- None yet"
     latest_answer = (turns[-1].get("answer", "").strip() if turns else "")
     provided_name = (candidate_name or "").strip() or "Unknown"
+    if response_cache.enabled_for("interviewer"):
+        # A random token would make every prompt unique; derive it from the turn instead
+        # so a client retry of the same turn maps to the same cache entry.
+        seed = f"{domain}|{experience}|{provided_name}|{asked_block}|{latest_answer}|{len(turns)}"
+        variation_token = hashlib.sha256(seed.encode("utf-8")).hexdigest()[:6]
+    else:
+        variation_token = secrets.token_hex(3)
+    summary_block = (
+        "\nEarlier in the session (summary of turns no longer shown below):\n"
+        f"{session_summary.strip()}\n"
+        if session_summary and session_summary.strip()
+        else ""
+    )
     behavior_hint = (
         f"\nDemo override: Treat this candidate as {normalized_override} regardless of the latest answer."
         if normalized_override
         else ""
     )
-    base_user_message = (
-        "Interview context:\n"
-        f"- Role/Domain: {domain or 'General'}\n"
-        f"- Experience: {experience or 'Unspecified'}\n"
-        f"- Candidate name: {provided_name}\n"
-        f"{resume_block}"
-        f"- Session stage: {session_stage}\n"
-        "- Previously asked questions (do NOT repeat verbatim):\n"
-        f"{asked_block}\n"
-        f"- Variation token (use as creative inspiration so openings differ each run): {variation_token}\n"
-        "\nConversation so far:\n"
-        f"{history_text}\n\n"
-        "Latest candidate answer:\n"
-        f"{latest_answer or '(no answer yet; start the session)'}\n\n"
-        "Guidelines:\n"
-        "1. If stage is opening, welcome the candidate by name, mention the role, and state how the interview will flow before posing the first question.\n"
-        "2. If stage is follow-up, briefly reflect or acknowledge their previous answer before asking the next question.\n"
-        "3. Sound human—mix pacing, avoid repetitive templates, and keep it under three sentences.\n"
-        "4. Enforce behavior-specific handling per the system prompt, especially for Edge-Case inputs.\n"
-        "5. Never leak the JSON requirement—respond only with valid JSON containing 'behavior' and 'question'."
-        f"{behavior_hint}\n"
-        "Remember to reply ONLY with JSON containing 'behavior' and 'question'."
+    local_hint = (
+        f"Local pre-label (heuristic; overrule it if the answer says otherwise): {local_behavior['behavior']}"
+        f" ({', '.join(local_behavior['signals']) or 'no strong signals'})\n\n"
+        if local_behavior and not normalized_override
+        else ""
+    )
+    sections = [
+        PromptSection(
+            "context",
+            [
+                "Interview context:\n"
+                f"- Role/Domain: {domain or 'General'}\n"
+                f"- Experience: {experience or 'Unspecified'}\n"
+                f"- Candidate name: {provided_name}\n"
+            ],
+        ),
+        PromptSection(
+            "resume",
+            split_words(resume_context),
+            trim_priority=1,
+            trim_from="end",
+            separator=" ",
+            prefix="Resume highlights:\n",
+            suffix="\n\n",
+        ),
+        PromptSection(
+            "session",
+            [
+                f"- Session stage: {session_stage}\n"
+                "- Previously asked questions (do NOT repeat verbatim):\n"
+                f"{asked_block}\n"
+                f"- Variation token (use as creative inspiration so openings differ each run): {variation_token}\n"
+                f"{summary_block}"
+                "\nConversation so far:\n"
+            ],
+        ),
+        PromptSection(
+            "history",
+            _history_blocks(turns),
+            trim_priority=2,
+            trim_from="start",
+            separator="\n\n",
+            suffix="\n\n",
+            empty_text="No prior questions.",
+        ),
+        PromptSection(
+            "instructions",
+            [
+                "Latest candidate answer:\n"
+                f"{latest_answer or '(no answer yet; start the session)'}\n\n"
+                f"{local_hint}"
+                "Guidelines:\n"
+                "1. If stage is opening, welcome the candidate by name, mention the role, and state how the interview will flow before posing the first question.\n"
+                "2. If stage is follow-up, briefly reflect or acknowledge their previous answer before asking the next question.\n"
+                "3. Sound human—mix pacing, avoid repetitive templates, and keep it under three sentences.\n"
+                "4. Enforce behavior-specific handling per the system prompt, especially for Edge-Case inputs.\n"
+                "5. Never leak the JSON requirement—respond only with valid JSON containing 'behavior' and 'question'."
+                f"{behavior_hint}\n"
+                "Remember to reply ONLY with JSON containing 'behavior' and 'question'."
+            ],
+        ),
+    ]
+    user_message, _ = assemble_prompt(
+        sections,
+        settings.interviewer_input_token_budget,
+        "interviewer",
+        fixed_overhead=SYSTEM_PROMPT_TOKENS,
     )
+    return user_message
+
+
+async def generate_interview_question(
+    history: Iterable[dict[str, str]],
+    domain: str,
+    experience: str,
+    behavior_override: Optional[str] = None,
+    resume_context: Optional[str] = None,
+    candidate_name: Optional[str] = None,
+    question_index: Optional[QuestionIndex] = None,
+    session_summary: Optional[str] = None,
+) -> QuestionResult:
+    """Return the next interview question and detected behavior."""
+
+    turns = list(history)[-MAX_HISTORY_TURNS:]
+    client = get_groq_client()
+    normalized_override = _normalize_behavior_label(behavior_override)
+    local_behavior = _local_behavior(turns)
+    fallback_behavior = normalized_override or (
+        local_behavior["behavior"] if local_behavior else DEFAULT_BEHAVIOR
+    )
+    route = _interviewer_route(turns, local_behavior)
+    asked_questions = _asked_questions(turns)
+    if question_index is None:
+        question_index = QuestionIndex.from_questions(asked_questions)
+
+    if client is None:
+        logger.warning("Groq client not configured; returning a question from the offline bank")
+        return _offline_question(
+            turns, domain, experience, resume_context, candidate_name, question_index, fallback_behavior
+        )
+
+    base_user_message = _build_user_message(
+        turns,
+        domain,
+        experience,
+        asked_questions,
+        normalized_override,
+        resume_context,
+        candidate_name,
+        session_summary,
+        local_behavior,
+    )
+
+    if settings.interviewer_parallel_candidates > 1:
+        hedged = await _generate_hedged(
+            client,
+            base_user_message,
+            question_index,
+            normalized_override,
+            settings.interviewer_parallel_candidates,
+            fallback_behavior,
+            route,
+        )
+        return hedged or _offline_question(
+            turns, domain, experience, resume_context, candidate_name, question_index, fallback_behavior
+        )
 
     last_error: Optional[Exception] = None
     attempt_hint = ""
     for attempt in range(1, MAX_GENERATION_ATTEMPTS + 1):
         try:
-            user_message = base_user_message + attempt_hint
-            response = client.chat.completions.create(
-                model=settings.groq_model or DEFAULT_MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                ],
-                temperature=0.55,
-                max_tokens=220,
+            parsed = await _request_question(
+                client,
+                base_user_message + attempt_hint,
+                normalized_override,
+                fallback_behavior,
+                route=route,
+                cacheable=True,
             )
-            content = response.choices[0].message.content.strip()
-            parsed = _parse_question_result(content)
-            if normalized_override:
-                parsed["behavior"] = normalized_override
-            if _should_retry(parsed.get("question", ""), asked_questions) and attempt < MAX_GENERATION_ATTEMPTS:
+            if _should_retry(parsed.get("question", ""), question_index) and attempt < MAX_GENERATION_ATTEMPTS:
                 logger.warning(
                     "Retrying question generation (attempt %s) due to invalid/duplicate output", attempt
                 )
@@ -228,12 +384,232 @@ def generate_interview_question(
                     f"'{duplicate}'. Provide a NEW, distinct question not in the asked list above."
                 )
                 continue
+            if parsed["question"] == FALLBACK_QUESTION:
+                break
             return parsed
+        except (CircuitOpenError, DeadlineExceeded) as exc:
+            logger.warning("Skipping question generation: %s", exc)
+            break
         except Exception as exc:
             last_error = exc
             logger.exception("Groq question generation failed on attempt %s: %s", attempt, exc)
 
-    return {
-        "question": FALLBACK_QUESTION,
-        "behavior": normalized_override or DEFAULT_BEHAVIOR,
-    }
+    return _offline_question(
+        turns, domain, experience, resume_context, candidate_name, question_index, fallback_behavior
+    )
+
+
+async def _request_question(
+    client: AsyncGroq,
+    user_message: str,
+    normalized_override: Optional[BehaviorCategory],
+    fallback_behavior: BehaviorCategory = DEFAULT_BEHAVIOR,
+    route: str = "interviewer.follow_up",
+    cacheable: bool = False,
+) -> QuestionResult:
+    model = model_router.select(route)
+
+    async def produce() -> str:
+        response = await model_router.call(
+            model,
+            lambda timeout: client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message},
+                ],
+                timeout=timeout,
+                **INTERVIEWER_PARAMS,
+            ),
+            settings.llm_timeout_seconds,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    if cacheable:
+        content = await cached_completion(
+            "interviewer", cache_key(model, SYSTEM_PROMPT, user_message, **INTERVIEWER_PARAMS), produce
+        )
+    else:
+        content = await produce()
+    parsed = _parse_question_result(content, fallback_behavior)
+    if normalized_override:
+        parsed["behavior"] = normalized_override
+    return parsed
+
+
+async def _generate_hedged(
+    client: AsyncGroq,
+    user_message: str,
+    question_index: QuestionIndex,
+    normalized_override: Optional[BehaviorCategory],
+    candidates: int,
+    fallback_behavior: BehaviorCategory = DEFAULT_BEHAVIOR,
+    route: str = "interviewer.follow_up",
+) -> Optional[QuestionResult]:
+    """Fire ``candidates`` requests at once and keep the first usable question."""
+
+    tasks = [
+        asyncio.create_task(
+            _request_question(client, user_message, normalized_override, fallback_behavior, route=route)
+        )
+        for _ in range(candidates)
+    ]
+    first_parsed: Optional[QuestionResult] = None
+    try:
+        for finished in asyncio.as_completed(tasks):
+            try:
+                parsed = await finished
+            except Exception as exc:
+                logger.warning("Hedged question candidate failed: %s", exc)
+                continue
+            if not _should_retry(parsed.get("question", ""), question_index):
+                return parsed
+            if first_parsed is None and parsed.get("question") != FALLBACK_QUESTION:
+                first_parsed = parsed
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    logger.warning("All %s hedged question candidates were invalid or duplicates", candidates)
+    return first_parsed
+
+
+async def generate_opening_question(domain: str, experience: str) -> Optional[QuestionResult]:
+    """Generate a name-free opening question suitable for the shared opening pool."""
+
+    client = get_groq_client()
+    if client is None:
+        return None
+
+    user_message = (
+        "Interview context:\n"
+        f"- Role/Domain: {domain or 'General'}\n"
+        f"- Experience: {experience or 'Unspecified'}\n"
+        "- Session stage: opening (pre-generated)\n"
+        f"- Variation token (use as creative inspiration so openings differ each run): {secrets.token_hex(3)}\n\n"
+        "Guidelines:\n"
+        "1. The greeting and candidate name are added separately, so do NOT greet the candidate or use any name.\n"
+        "2. In one sentence, set expectations for how the interview will flow, then pose the first question for this role and experience level.\n"
+        "3. Sound human and keep it under three sentences.\n"
+        "Remember to reply ONLY with JSON containing 'behavior' and 'question'."
+    )
+    try:
+        parsed = await _request_question(client, user_message, None, route="opening_pool")
+    except Exception as exc:
+        logger.warning("Opening question generation failed for %s/%s: %s", domain, experience, exc)
+        return None
+    if parsed["question"] == FALLBACK_QUESTION:
+        return None
+    return parsed
+
+
+async def stream_interview_question(
+    history: Iterable[dict[str, str]],
+    domain: str,
+    experience: str,
+    behavior_override: Optional[str] = None,
+    resume_context: Optional[str] = None,
+    candidate_name: Optional[str] = None,
+    question_index: Optional[QuestionIndex] = None,
+    session_summary: Optional[str] = None,
+) -> AsyncIterator[QuestionStreamEvent]:
+    """Stream the next question as it is generated."""
+
+    turns = list(history)[-MAX_HISTORY_TURNS:]
+    client = get_groq_client()
+    normalized_override = _normalize_behavior_label(behavior_override)
+    local_behavior = _local_behavior(turns)
+    fallback_behavior = normalized_override or (
+        local_behavior["behavior"] if local_behavior else DEFAULT_BEHAVIOR
+    )
+    route = _interviewer_route(turns, local_behavior)
+    asked_questions = _asked_questions(turns)
+    if question_index is None:
+        question_index = QuestionIndex.from_questions(asked_questions)
+
+    if client is None:
+        logger.warning("Groq client not configured; returning a question from the offline bank")
+        offline = _offline_question(
+            turns, domain, experience, resume_context, candidate_name, question_index, fallback_behavior
+        )
+        yield {"event": "done", "question": offline["question"], "behavior": offline["behavior"]}
+        return
+
+    user_message = _build_user_message(
+        turns,
+        domain,
+        experience,
+        asked_questions,
+        normalized_override,
+        resume_context,
+        candidate_name,
+        session_summary,
+        local_behavior,
+    )
+    extractor = IncrementalJSONFieldExtractor(("behavior", "question"))
+    raw_parts: List[str] = []
+    behavior_sent = False
+    model = model_router.select(route)
+    stream = None
+    try:
+        stream = await model_router.call(
+            model,
+            lambda timeout: client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message},
+                ],
+                stream=True,
+                timeout=timeout,
+                **INTERVIEWER_PARAMS,
+            ),
+            settings.llm_timeout_seconds,
+        )
+    except (CircuitOpenError, DeadlineExceeded) as exc:
+        logger.warning("Skipping streamed question generation: %s", exc)
+    except Exception as exc:
+        # The breaker and the router have already counted the failed open.
+        logger.exception("Groq question stream could not be opened: %s", exc)
+
+    if stream is not None:
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                raw_parts.append(delta)
+                for field, text in extractor.feed(delta):
+                    if field == "question":
+                        yield {"event": "token", "text": text}
+                if not behavior_sent and "behavior" in extractor.completed:
+                    behavior = normalized_override or _normalize_behavior_label(extractor.values["behavior"])
+                    if behavior:
+                        behavior_sent = True
+                        yield {"event": "behavior", "behavior": behavior}
+        except Exception as exc:
+            # The open was recorded as a success; a stream that breaks midway still counts.
+            get_breaker(model).record_failure()
+            model_router.record(model, 0.0, ok=False)
+            logger.exception("Groq question streaming failed: %s", exc)
+            raw_parts = []
+
+    parsed = _parse_question_result("".join(raw_parts).strip(), fallback_behavior)
+    if normalized_override:
+        parsed["behavior"] = normalized_override
+    if _should_retry(parsed.get("question", ""), question_index):
+        logger.warning("Streamed question was invalid or duplicate; regenerating without streaming")
+        parsed = await generate_interview_question(
+            turns,
+            domain,
+            experience,
+            behavior_override=behavior_override,
+            resume_context=resume_context,
+            candidate_name=candidate_name,
+            question_index=question_index,
+            session_summary=session_summary,
+        )
+    yield {"event": "done", "question": parsed["question"], "behavior": parsed["behavior"]}
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Tuple, TypeVar
+
+from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded, get_breaker, guarded_call
+
+T = TypeVar("T")
+
+TIER_FAST = "fast"
+TIER_QUALITY = "quality"
+DEFAULT_FAST_MODEL = "llama-3.1-8b-instant"
+# Which tier each call site asks for; unknown routes get the quality tier.
+ROUTE_TIERS: Dict[str, str] = {
+    "interviewer.opening": TIER_QUALITY,
+    "interviewer.follow_up": TIER_FAST,
+    "interviewer.escalated": TIER_QUALITY,
+    "opening_pool": TIER_QUALITY,
+    "evaluator": TIER_QUALITY,
+    "evaluator.window": TIER_FAST,
+    "turn_scorer": TIER_FAST,
+    "summarizer": TIER_FAST,
+}
+MIN_SAMPLES = 5
+EXPLORE_PROBABILITY = 0.05
+
+
+def _split_models(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ModelRouter:
+    """Pick a Groq model per call from a tier, steering away from slow or failing models."""
+
+    def __init__(self, tiers: Dict[str, List[str]], window: int, slow_p95_seconds: float):
+        self.tiers = {tier: models for tier, models in tiers.items() if models}
+        self.window = window
+        self.slow_p95_seconds = slow_p95_seconds
+        self._samples: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._selections: Dict[str, Dict[str, int]] = {}
+        self._rng = random.Random()
+
+    def _model_stats(self, model: str) -> Dict[str, Any]:
+        samples = self._samples.get(model) or ()
+        latencies = sorted(latency for latency, ok in samples if ok)
+        failures = sum(1 for _, ok in samples if not ok)
+        return {
+            "samples": len(samples),
+            "p50_seconds": round(_percentile(latencies, 0.5), 3),
+            "p95_seconds": round(_percentile(latencies, 0.95), 3),
+            "error_rate": round(failures / len(samples), 3) if samples else 0.0,
+        }
+
+    def _score(self, model: str) -> float:
+        stats = self._model_stats(model)
+        if stats["samples"] < MIN_SAMPLES:
+            return 0.0
+        return stats["p95_seconds"] * (1 + 4 * stats["error_rate"])
+
+    def _healthy(self, model: str) -> bool:
+        if get_breaker(model).rejecting():
+            return False
+        stats = self._model_stats(model)
+        return stats["samples"] < MIN_SAMPLES or (
+            stats["p95_seconds"] <= self.slow_p95_seconds and stats["error_rate"] < 0.5
+        )
+
+    def select(self, route: str) -> str:
+        tier = ROUTE_TIERS.get(route, TIER_QUALITY)
+        preferred = self.tiers.get(tier) or next(iter(self.tiers.values()))
+        candidates = [model for model in preferred if self._healthy(model)]
+        if not candidates:
+            everything = list(dict.fromkeys(model for models in self.tiers.values() for model in models))
+            candidates = [model for model in everything if not get_breaker(model).rejecting()] or preferred
+        if len(candidates) > 1 and self._rng.random() < EXPLORE_PROBABILITY:
+            model = self._rng.choice(candidates)
+        else:
+            model = min(candidates, key=self._score)
+        route_counts = self._selections.setdefault(route, {})
+        route_counts[model] = route_counts.get(model, 0) + 1
+        return model
+
+    def record(self, model: str, latency: float, ok: bool) -> None:
+        samples = self._samples.get(model)
+        if samples is None:
+            samples = self._samples[model] = deque(maxlen=self.window)
+        samples.append((latency, ok))
+
+    async def call(self, model: str, call: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        """``guarded_call`` for ``model`` that also feeds the latency/error window."""
+
+        started = time.monotonic()
+        try:
+            result = await guarded_call(model, call, timeout)
+        except (CircuitOpenError, DeadlineExceeded):
+            raise
+        except Exception:
+            self.record(model, time.monotonic() - started, ok=False)
+            raise
+        self.record(model, time.monotonic() - started, ok=True)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        models = list(dict.fromkeys(model for names in self.tiers.values() for model in names))
+        return {
+            "tiers": self.tiers,
+            "models": {model: self._model_stats(model) for model in models},
+            "routes": {route: dict(counts) for route, counts in self._selections.items()},
+        }
+
+
+model_router = ModelRouter(
+    tiers={
+        TIER_FAST: _split_models(settings.groq_fast_models) or [DEFAULT_FAST_MODEL],
+        TIER_QUALITY: _split_models(settings.groq_quality_models) or [settings.groq_model or DEFAULT_FAST_MODEL],
+    },
+    window=settings.router_window,
+    slow_p95_seconds=settings.router_slow_p95_seconds,
+)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from config import EXPERIENCE_LEVELS, INTERVIEW_DOMAINS, settings
+
+from .interviewer import generate_opening_question
+from .similarity import QuestionIndex
+
+REFRESH_INTERVAL_SECONDS = 60
+MAX_CONCURRENT_REFILLS = 2
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str]
+
+
+def _pool_key(domain: str, experience: str) -> PoolKey:
+    return ((domain or "").strip().lower(), (experience or "").strip().lower())
+
+
+class OpeningQuestionPool:
+    """Background-filled pool of name-free opening questions per (domain, experience)."""
+
+    def __init__(
+        self,
+        combos: Iterable[Tuple[str, str]],
+        size: int,
+        low_watermark: int,
+        ttl_seconds: int,
+    ):
+        self._labels: Dict[PoolKey, Tuple[str, str]] = {
+            _pool_key(domain, experience): (domain, experience) for domain, experience in combos
+        }
+        self._entries: Dict[PoolKey, Deque[Tuple[float, str]]] = {
+            key: deque() for key in self._labels
+        }
+        self.size = size
+        self.low_watermark = low_watermark
+        self.ttl_seconds = ttl_seconds
+        self._refilling: Set[PoolKey] = set()
+        self._refill_tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _drop_expired(self, key: PoolKey) -> None:
+        entries = self._entries[key]
+        cutoff = time.monotonic() - self.ttl_seconds
+        while entries and entries[0][0] < cutoff:
+            entries.popleft()
+
+    def pop(self, domain: str, experience: str) -> Optional[str]:
+        """Return a fresh pooled opening question, or None when the pool has none."""
+
+        key = _pool_key(domain, experience)
+        if key not in self._entries:
+            return None
+        self._drop_expired(key)
+        entries = self._entries[key]
+        question = entries.popleft()[1] if entries else None
+        if len(entries) <= self.low_watermark:
+            self._schedule_refill(key)
+        return question
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        if key in self._refilling or self._task is None:
+            return
+        self._refilling.add(key)
+        task = asyncio.get_running_loop().create_task(self._refill(key))
+        self._refill_tasks.add(task)
+        task.add_done_callback(self._refill_tasks.discard)
+
+    async def _refill(self, key: PoolKey) -> None:
+        domain, experience = self._labels[key]
+        try:
+            async with self._semaphore or asyncio.Semaphore(MAX_CONCURRENT_REFILLS):
+                entries = self._entries[key]
+                index = QuestionIndex.from_questions(question for _, question in entries)
+                attempts = 0
+                while len(entries) < self.size and attempts < self.size * 2:
+                    attempts += 1
+                    result = await generate_opening_question(domain, experience)
+                    if result is None:
+                        break
+                    if index.is_near_duplicate(result["question"]):
+                        continue
+                    index.add(result["question"])
+                    entries.append((time.monotonic(), result["question"]))
+        except Exception as exc:
+            logger.warning("Opening pool refill failed for %s/%s: %s", domain, experience, exc)
+        finally:
+            self._refilling.discard(key)
+
+    async def _run(self) -> None:
+        while True:
+            for key in self._entries:
+                self._drop_expired(key)
+                if len(self._entries[key]) <= self.low_watermark:
+                    self._schedule_refill(key)
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFILLS)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        tasks = [self._task, *self._refill_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            f"{domain} / {experience}": len(self._entries[key])
+            for key, (domain, experience) in self._labels.items()
+        }
+
+
+opening_pool = OpeningQuestionPool(
+    ((domain, experience) for domain in INTERVIEW_DOMAINS for experience in EXPERIENCE_LEVELS),
+    size=settings.opening_pool_size,
+    low_watermark=settings.opening_pool_low_watermark,
+    ttl_seconds=settings.opening_pool_ttl_seconds,
+)
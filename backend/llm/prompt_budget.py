@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
+
+TRIM_MARKER = "(some content trimmed to fit the prompt budget)"
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Approximate a BPE token count without a tokenizer download."""
+
+    if not text:
+        return 0
+    return sum(
+        (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def split_words(text: Optional[str], chunk_size: int = 30) -> List[str]:
+    """Split free text into word chunks so it can be trimmed gradually."""
+
+    words = (text or "").split()
+    return [" ".join(words[idx : idx + chunk_size]) for idx in range(0, len(words), chunk_size)]
+
+
+class PromptSection:
+    """One block of a prompt."""
+
+    def __init__(
+        self,
+        name: str,
+        parts: Sequence[str],
+        trim_priority: Optional[int] = None,
+        trim_from: str = "start",
+        separator: str = "",
+        prefix: str = "",
+        suffix: str = "",
+        empty_text: str = "",
+    ):
+        self.name = name
+        self.parts = [part for part in parts if part]
+        self.trim_priority = trim_priority
+        self.trim_from = trim_from
+        self.separator = separator
+        self.prefix = prefix
+        self.suffix = suffix
+        self.empty_text = empty_text
+        self.trimmed_parts = 0
+
+    def render(self) -> str:
+        if not self.parts:
+            if self.trimmed_parts:
+                return f"{self.prefix}{TRIM_MARKER}{self.suffix}"
+            return f"{self.prefix}{self.empty_text}{self.suffix}" if self.empty_text else ""
+        body = self.separator.join(self.parts)
+        if self.trimmed_parts:
+            body = (
+                f"{TRIM_MARKER}{self.separator}{body}"
+                if self.trim_from == "start"
+                else f"{body}{self.separator}{TRIM_MARKER}"
+            )
+        return f"{self.prefix}{body}{self.suffix}"
+
+    def drop_one(self) -> bool:
+        if not self.parts:
+            return False
+        if self.trim_from == "start":
+            self.parts.pop(0)
+        else:
+            self.parts.pop()
+        self.trimmed_parts += 1
+        return True
+
+
+class PromptReport(TypedDict):
+    call_type: str
+    budget: int
+    total_tokens: int
+    within_budget: bool
+    sections: Dict[str, int]
+    trimmed_parts: Dict[str, int]
+
+
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def assemble_prompt(
+    sections: List[PromptSection],
+    budget: int,
+    call_type: str,
+    fixed_overhead: int = 0,
+) -> Tuple[str, PromptReport]:
+    """Join ``sections`` and trim the trimmable ones until the estimate fits ``budget``."""
+
+    section_tokens = [estimate_tokens(section.render()) for section in sections]
+    current = fixed_overhead + sum(section_tokens)
+    trimmable = sorted(
+        (idx for idx, section in enumerate(sections) if section.trim_priority is not None),
+        key=lambda idx: sections[idx].trim_priority,
+    )
+    for idx in trimmable:
+        section = sections[idx]
+        while current > budget and section.drop_one():
+            updated = estimate_tokens(section.render())
+            current += updated - section_tokens[idx]
+            section_tokens[idx] = updated
+        if current <= budget:
+            break
+
+    report: PromptReport = {
+        "call_type": call_type,
+        "budget": budget,
+        "total_tokens": current,
+        "within_budget": current <= budget,
+        "sections": {section.name: tokens for section, tokens in zip(sections, section_tokens)},
+        "trimmed_parts": {
+            section.name: section.trimmed_parts for section in sections if section.trimmed_parts
+        },
+    }
+    _record(report)
+    if report["trimmed_parts"] or not report["within_budget"]:
+        logger.info(
+            "%s prompt trimmed to %s/%s tokens (removed parts: %s)",
+            call_type,
+            current,
+            budget,
+            report["trimmed_parts"],
+        )
+    return "".join(section.render() for section in sections), report
+
+
+def _record(report: PromptReport) -> None:
+    entry = _stats.setdefault(
+        report["call_type"],
+        {"calls": 0, "trimmed_calls": 0, "over_budget_calls": 0, "last_tokens": 0, "max_tokens": 0},
+    )
+    entry["calls"] += 1
+    entry["trimmed_calls"] += 1 if report["trimmed_parts"] else 0
+    entry["over_budget_calls"] += 0 if report["within_budget"] else 1
+    entry["last_tokens"] = report["total_tokens"]
+    entry["max_tokens"] = max(entry["max_tokens"], report["total_tokens"])
+
+
+def prompt_stats() -> Dict[str, Dict[str, int]]:
+    """Per call type prompt-size counters since process start."""
+
+    return {call_type: dict(entry) for call_type, entry in _stats.items()}
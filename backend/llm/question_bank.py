@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TypedDict
+
+from .similarity import QuestionIndex, content_words, minhash_signature
+
+BANK_PATH = Path(__file__).resolve().parent / "data" / "question_bank.json"
+ANY = "*"
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Keywords and the topic are repeated so they outweigh incidental words in the question.
+KEYWORD_WEIGHT = 2
+# Pick randomly among near-best matches so repeated fallbacks do not look scripted.
+TOP_CHOICES = 3
+MAX_QUERY_TERMS = 200
+
+logger = logging.getLogger(__name__)
+
+
+class BankQuestion(TypedDict):
+    domain: str
+    experience: List[str]
+    topic: str
+    keywords: List[str]
+    question: str
+
+
+class QuestionBank:
+    """Offline interview questions with a BM25 index for when the LLM is unavailable."""
+
+    def __init__(self, entries: List[BankQuestion]):
+        self.entries = entries
+        self._docs: List[Counter] = []
+        self._signatures = [minhash_signature(entry["question"]) for entry in entries]
+        for entry in entries:
+            terms = content_words(entry["question"])
+            for keyword in [entry["topic"], *entry["keywords"]]:
+                terms.extend(content_words(keyword) * KEYWORD_WEIGHT)
+            self._docs.append(Counter(terms))
+        lengths = [sum(doc.values()) for doc in self._docs]
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_frequency: Counter = Counter()
+        for doc in self._docs:
+            document_frequency.update(doc.keys())
+        total = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_frequency.items()
+        }
+        self._rng = random.Random()
+        self.served = 0
+
+    @classmethod
+    def load(cls, path: Path = BANK_PATH) -> "QuestionBank":
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Question bank unavailable at %s: %s", path, exc)
+            entries = []
+        return cls(entries)
+
+    def _bm25(self, idx: int, query_terms: Counter) -> float:
+        doc = self._docs[idx]
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[idx] / (self._avg_length or 1))
+        score = 0.0
+        for term in query_terms:
+            freq = doc.get(term)
+            if freq:
+                score += self._idf[term] * freq * (BM25_K1 + 1) / (freq + norm)
+        return score
+
+    def _candidates(self, domain: str, experience: str) -> List[int]:
+        def matches(entry: BankQuestion, exact_domain: bool) -> bool:
+            domain_ok = entry["domain"] == domain if exact_domain else entry["domain"] == ANY
+            return domain_ok and (experience in entry["experience"] or ANY in entry["experience"])
+
+        specific = [idx for idx, entry in enumerate(self.entries) if matches(entry, True)]
+        general = [idx for idx, entry in enumerate(self.entries) if matches(entry, False)]
+        return specific + general
+
+    def search(
+        self,
+        domain: str,
+        experience: str,
+        query: str = "",
+        question_index: Optional[QuestionIndex] = None,
+    ) -> Optional[str]:
+        """Best unasked question for the domain/level and ``query``, or None if exhausted."""
+
+        candidates = self._candidates(domain, experience)
+        if question_index is not None and question_index.signatures:
+            candidates = [
+                idx for idx in candidates if not question_index.is_near_duplicate_signature(self._signatures[idx])
+            ]
+        if not candidates:
+            return None
+
+        query_terms = Counter(content_words(query)[:MAX_QUERY_TERMS])
+        scored = sorted(
+            ((self._bm25(idx, query_terms), idx) for idx in candidates),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        best = scored[0][0]
+        if best > 0:
+            shortlist = [idx for score, idx in scored[:TOP_CHOICES] if score >= best * 0.5]
+        else:
+            # Nothing matched the query; prefer domain-specific entries, which come first.
+            domain_specific = [idx for idx in candidates if self.entries[idx]["domain"] == domain]
+            shortlist = domain_specific or candidates
+        self.served += 1
+        return self.entries[self._rng.choice(shortlist)]["question"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"questions": len(self.entries), "served": self.served}
+
+
+question_bank = QuestionBank.load()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+from config import settings
+from db import get_llm_cache_collection
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, system_prompt: str, user_message: str, **params: Any) -> str:
+    """Content address of one completion request: model, both prompts, sampling params."""
+
+    payload = json.dumps(
+        {"model": model, "system": system_prompt, "user": user_message, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of completion text keyed by ``cache_key``."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, use_mongo: bool, call_types: str):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_mongo = use_mongo
+        self.call_types = {name.strip() for name in call_types.split(",") if name.strip()}
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    def enabled_for(self, call_type: str) -> bool:
+        return self.max_entries > 0 and call_type in self.call_types
+
+    def _count(self, call_type: str, field: str) -> None:
+        entry = self._stats.setdefault(
+            call_type, {"hits": 0, "mongo_hits": 0, "misses": 0, "stores": 0}
+        )
+        entry[field] += 1
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _mongo(self):
+        # Expired documents are removed by the TTL index declared in db/indexes.py.
+        return get_llm_cache_collection() if self.use_mongo else None
+
+    async def get(self, call_type: str, key: str) -> Optional[str]:
+        cached = self._entries.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(call_type, "hits")
+                return value
+            del self._entries[key]
+
+        try:
+            collection = self._mongo()
+            if collection is not None:
+                doc = await collection.find_one({"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}})
+                if doc is not None:
+                    remaining = doc["expires_at"].replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+                    self._remember(key, doc["value"], time.monotonic() + remaining.total_seconds())
+                    self._count(call_type, "mongo_hits")
+                    return doc["value"]
+        except Exception as exc:
+            logger.warning("LLM cache lookup in Mongo failed: %s", exc)
+
+        self._count(call_type, "misses")
+        return None
+
+    async def set(self, call_type: str, key: str, value: str) -> None:
+        self._remember(key, value, time.monotonic() + self.ttl_seconds)
+        self._count(call_type, "stores")
+        try:
+            collection = self._mongo()
+            if collection is not None:
+                await collection.replace_one(
+                    {"_id": key},
+                    {
+                        "_id": key,
+                        "call_type": call_type,
+                        "value": value,
+                        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+                    },
+                    upsert=True,
+                )
+        except Exception as exc:
+            logger.warning("LLM cache write to Mongo failed: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "mongo": self.use_mongo,
+            "call_types": {name: dict(entry) for name, entry in self._stats.items()},
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    use_mongo=settings.llm_cache_mongo,
+    call_types=settings.llm_cache_call_types,
+)
+
+
+async def cached_completion(
+    call_type: str,
+    key: str,
+    produce: Callable[[], Awaitable[str]],
+) -> str:
+    """Return cached text for ``key`` or run ``produce`` and cache a non-empty result."""
+
+    if not response_cache.enabled_for(call_type):
+        return await produce()
+    cached = await response_cache.get(call_type, key)
+    if cached is not None:
+        return cached
+    value = await produce()
+    if value:
+        await response_cache.set(call_type, key, value)
+    return value
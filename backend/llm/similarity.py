@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import struct
+from typing import Iterable, List, Optional, Set
+
+NUM_PERMUTATIONS = 64
+# b-bit MinHash: only the low 16 bits of each minimum are kept, packed into one bytes value
+# (128 bytes per signature), so a chance collision adds ~1/65536 to each estimate.
+_SIGNATURE_FORMAT = f"<{NUM_PERMUTATIONS}H"
+# Estimated Jaccard over content words; see THRESHOLD_EXAMPLES for where the cut-off falls.
+NEAR_DUPLICATE_THRESHOLD = 0.65
+# Sessions keep signatures of their latest questions only, so the stored index stays bounded.
+MAX_SESSION_SIGNATURES = 100
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "can", "could", "do", "does", "for",
+    "from", "how", "i", "in", "is", "it", "me", "of", "on", "or", "please", "so",
+    "that", "the", "this", "to", "us", "was", "we", "what", "when", "which", "would",
+    "you", "your",
+    # Contraction fragments ("you're", "we'll") and question framing that carries no topic.
+    "re", "ll", "ve", "d", "m", "s", "t", "about", "tell", "describe", "explain", "walk",
+    "through", "give", "talk", "share", "most", "some", "any", "have", "has", "had", "did",
+}
+# (first, second, near duplicate?) pairs the threshold is tuned against; one swapped
+# topic word in a short question must not count, a reworded question must.
+THRESHOLD_EXAMPLES = [
+    ("Could you walk me through a project you're proud of?", "Tell me about a project you are most proud of.", True),
+    ("How would you design a REST API for an orders service?", "How would you design the REST API for an order service?", True),
+    ("Explain the difference between a list and a tuple in Python.", "What is the difference between a Python list and a tuple?", True),
+    ("Design a REST API for orders", "Design a REST API for payments", False),
+    ("What is your experience with Django?", "What is your experience with Flask?", False),
+    ("Explain the difference between a list and a tuple in Python.", "Explain the difference between a process and a thread.", False),
+]
+
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+Signature = bytes
+
+
+def normalize_question(text: Optional[str]) -> str:
+    """Lowercase, drop punctuation, and collapse whitespace."""
+
+    return " ".join(_TOKEN_PATTERN.findall((text or "").lower()))
+
+
+def content_words(text: Optional[str]) -> List[str]:
+    """Normalized non-stopword tokens; a trailing "s" is dropped so "order" matches "orders"."""
+
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") else word
+        for word in normalize_question(text).split()
+        if word not in _STOPWORDS
+    ]
+
+
+def _shingles(text: str) -> Set[str]:
+    # Single content words: bigrams punish reordering ("a list and a tuple in Python" vs
+    # "a Python list and a tuple") while adding little for questions this short.
+    return set(content_words(text))
+
+
+def _stable_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash_signature(text: Optional[str]) -> Signature:
+    """Return a packed MinHash signature over the content words of ``text``."""
+
+    hashes = [_stable_hash(shingle) % _MERSENNE_PRIME for shingle in _shingles(text or "")]
+    if not hashes:
+        return b""
+    return struct.pack(
+        _SIGNATURE_FORMAT,
+        *(min((a * value + b) % _MERSENNE_PRIME for value in hashes) & 0xFFFF for a, b in _PERMUTATIONS),
+    )
+
+
+def estimate_similarity(first: Signature, second: Signature) -> float:
+    if not first or not second or len(first) != len(second):
+        return 0.0
+    left, right = struct.unpack(_SIGNATURE_FORMAT, first), struct.unpack(_SIGNATURE_FORMAT, second)
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERMUTATIONS
+
+
+class QuestionIndex:
+    """Per-session near-duplicate index over every question asked so far."""
+
+    def __init__(
+        self,
+        signatures: Optional[Iterable[Signature]] = None,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    ):
+        self.signatures: List[Signature] = [
+            bytes(signature) for signature in (signatures or []) if signature
+        ]
+        self.threshold = threshold
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[str]) -> "QuestionIndex":
+        return cls(minhash_signature(question) for question in questions)
+
+    @classmethod
+    def from_session(cls, session: dict) -> "QuestionIndex":
+        """Load the stored signatures, rebuilding them for sessions created before the index."""
+
+        signatures = session.get("question_signatures") or []
+        questions = session.get("questions") or []
+        if len(signatures) < len(questions):
+            return cls.from_questions(questions)
+        return cls(signatures)
+
+    def max_similarity(self, question: str) -> float:
+        return self.max_signature_similarity(minhash_signature(question))
+
+    def max_signature_similarity(self, signature: Signature) -> float:
+        """Like ``max_similarity`` for a precomputed signature."""
+
+        return max(
+            (estimate_similarity(signature, existing) for existing in self.signatures),
+            default=0.0,
+        )
+
+    def is_near_duplicate(self, question: str) -> bool:
+        return self.max_similarity(question) >= self.threshold
+
+    def is_near_duplicate_signature(self, signature: Signature) -> bool:
+        return self.max_signature_similarity(signature) >= self.threshold
+
+    def add(self, question: str) -> Signature:
+        signature = minhash_signature(question)
+        if signature:
+            self.signatures.append(signature)
+        return signature
+
+
+# ``python -m llm.similarity`` from backend/: estimated similarity of each threshold example.
+if __name__ == "__main__":
+    for first, second, expected in THRESHOLD_EXAMPLES:
+        score = estimate_similarity(minhash_signature(first), minhash_signature(second))
+        verdict = "ok" if (score >= NEAR_DUPLICATE_THRESHOLD) == expected else "MISMATCH"
+        print(f"{score:.2f} {verdict:8} {first!r} vs {second!r}")
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class IncrementalJSONFieldExtractor:
+    """Pull top-level string fields out of a JSON object while it is still streaming."""
+
+    def __init__(self, fields: Iterable[str]):
+        self._fields = set(fields)
+        self.values: Dict[str, str] = {}
+        self.completed: Set[str] = set()
+        self._depth = 0
+        self._in_string = False
+        self._is_value = False
+        self._expect_value = False
+        self._escape = False
+        self._unicode_digits: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._buffer: List[str] = []
+        self._last_key: Optional[str] = None
+
+    def _tracking(self) -> bool:
+        return self._is_value and self._depth == 1 and self._last_key in self._fields
+
+    def _append(self, text: str, deltas: List[Tuple[str, str]]) -> None:
+        self._buffer.append(text)
+        if self._tracking():
+            key = self._last_key or ""
+            self.values[key] = self.values.get(key, "") + text
+            if deltas and deltas[-1][0] == key:
+                deltas[-1] = (key, deltas[-1][1] + text)
+            else:
+                deltas.append((key, text))
+
+    def _append_code_point(self, code_point: int, deltas: List[Tuple[str, str]]) -> None:
+        if 0xD800 <= code_point <= 0xDBFF:
+            self._high_surrogate = code_point
+            return
+        if 0xDC00 <= code_point <= 0xDFFF and self._high_surrogate is not None:
+            code_point = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code_point - 0xDC00)
+        self._high_surrogate = None
+        self._append(chr(code_point), deltas)
+
+    def _close_string(self) -> None:
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._in_string = False
+        if self._is_value:
+            if self._tracking():
+                key = self._last_key or ""
+                self.values.setdefault(key, text)
+                self.completed.add(key)
+            self._expect_value = False
+        elif self._depth == 1:
+            self._last_key = text
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume ``chunk`` and return ``(field, new_text)`` pairs decoded from it."""
+
+        deltas: List[Tuple[str, str]] = []
+        for char in chunk or "":
+            if self._in_string:
+                if self._unicode_digits is not None:
+                    self._unicode_digits += char
+                    if len(self._unicode_digits) == 4:
+                        try:
+                            code_point = int(self._unicode_digits, 16)
+                        except ValueError:
+                            code_point = 0xFFFD
+                        self._unicode_digits = None
+                        self._append_code_point(code_point, deltas)
+                elif self._escape:
+                    self._escape = False
+                    if char == "u":
+                        self._unicode_digits = ""
+                    else:
+                        self._append(_SIMPLE_ESCAPES.get(char, char), deltas)
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._close_string()
+                else:
+                    self._append(char, deltas)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._is_value = self._expect_value
+                self._buffer = []
+            elif char == ":":
+                self._expect_value = True
+            elif char in "{[":
+                self._depth += 1
+                self._expect_value = False
+            elif char in "}]":
+                self._depth = max(0, self._depth - 1)
+                self._expect_value = False
+            elif char == ",":
+                self._expect_value = False
+        return deltas
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterable, List, Optional
+
+from clients import get_groq_client
+from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded
+
+from .model_router import model_router
+
+MAX_SUMMARY_WORDS = 120
+
+logger = logging.getLogger(__name__)
+
+
+SUMMARIZER_SYSTEM_PROMPT = (
+    "You maintain a running summary of a mock interview for the interviewer."
+    " Keep topics covered, notable strengths, weak or evasive answers, and promises to revisit something."
+    " Write compact plain text with no preamble."
+)
+
+
+def _turns_to_text(turns: Iterable[dict[str, str]]) -> str:
+    lines: List[str] = []
+    for turn in turns:
+        question = (turn.get("question") or "").strip()
+        answer = (turn.get("answer") or "").strip() or "(no answer provided)"
+        if question:
+            lines.append(f"Q: {question}\nA: {answer}")
+    return "\n\n".join(lines)
+
+
+async def summarize_turns(
+    previous_summary: Optional[str],
+    turns: Iterable[dict[str, str]],
+    domain: str,
+) -> Optional[str]:
+    """Fold ``turns`` into ``previous_summary``; returns None if the update failed."""
+
+    turns_text = _turns_to_text(turns)
+    if not turns_text:
+        return previous_summary or ""
+
+    client = get_groq_client()
+    if client is None:
+        return None
+
+    user_message = (
+        f"Role/Domain: {domain or 'General'}\n\n"
+        "Current summary:\n"
+        f"{(previous_summary or '').strip() or '(empty; this is the start of the session)'}\n\n"
+        "New turns to fold in:\n"
+        f"{turns_text}\n\n"
+        f"Return the updated summary in under {MAX_SUMMARY_WORDS} words."
+    )
+    try:
+        model = model_router.select("summarizer")
+        response = await model_router.call(
+            model,
+            lambda timeout: client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SUMMARIZER_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=0.2,
+                max_tokens=200,
+                timeout=timeout,
+            ),
+            settings.llm_timeout_seconds,
+        )
+        content = response.choices[0].message.content.strip()
+        return content or None
+    except (CircuitOpenError, DeadlineExceeded) as exc:
+        logger.warning("Skipping summary update: %s", exc)
+        return None
+    except Exception as exc:
+        logger.exception("Groq summary update failed: %s", exc)
+        return None
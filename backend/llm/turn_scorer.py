@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional, TypedDict
+
+from clients import get_groq_client
+from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded
+
+from .interviewer import _attempt_json_load
+from .model_router import model_router
+from .response_cache import cache_key, cached_completion
+
+RUBRIC_DIMENSIONS = ("communication", "technical_depth", "structure", "confidence")
+MIN_SCORE = 1
+MAX_SCORE = 5
+SCORER_PARAMS = {"temperature": 0.1, "max_tokens": 150}
+
+logger = logging.getLogger(__name__)
+
+
+class TurnNote(TypedDict):
+    turn: int
+    scores: Dict[str, int]
+    comment: str
+
+
+SCORER_SYSTEM_PROMPT = (
+    "You score a single answer from a mock interview against a fixed rubric. "
+    f"Rate each dimension from {MIN_SCORE} (poor) to {MAX_SCORE} (excellent) relative to the role and level, "
+    "and add one frank sentence explaining the main strength or gap. "
+    "Respond with JSON only, shaped as "
+    '{"scores": {' + ", ".join(f'"{name}": <int>' for name in RUBRIC_DIMENSIONS) + '}, "comment": "..."}.'
+)
+
+
+def _parse_turn_note(content: str, turn: int) -> Optional[TurnNote]:
+    data = _attempt_json_load(content)
+    raw_scores = data.get("scores") if isinstance(data.get("scores"), dict) else {}
+    scores: Dict[str, int] = {}
+    for name in RUBRIC_DIMENSIONS:
+        try:
+            value = int(round(float(raw_scores.get(name))))
+        except (TypeError, ValueError):
+            continue
+        scores[name] = min(MAX_SCORE, max(MIN_SCORE, value))
+    comment = str(data.get("comment") or "").strip()
+    if not scores and not comment:
+        return None
+    return {"turn": turn, "scores": scores, "comment": comment}
+
+
+async def score_turn(
+    turn: int,
+    question: str,
+    answer: str,
+    domain: str,
+    experience: str,
+) -> Optional[TurnNote]:
+    """Score one answered turn (0-based ``turn``); returns None if scoring failed."""
+
+    client = get_groq_client()
+    if client is None:
+        return None
+
+    user_message = (
+        f"Target role / domain: {domain or 'Generalist'}\n"
+        f"Experience level: {experience or 'Unspecified'}\n\n"
+        f"Question {turn + 1}: {(question or '').strip() or '(question unavailable)'}\n"
+        f"Answer: {(answer or '').strip() or '(no answer provided)'}"
+    )
+    try:
+        model = model_router.select("turn_scorer")
+
+        async def produce() -> str:
+            response = await model_router.call(
+                model,
+                lambda timeout: client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": SCORER_SYSTEM_PROMPT},
+                        {"role": "user", "content": user_message},
+                    ],
+                    timeout=timeout,
+                    **SCORER_PARAMS,
+                ),
+                settings.llm_timeout_seconds,
+            )
+            return response.choices[0].message.content or ""
+
+        content = await cached_completion(
+            "turn_scorer", cache_key(model, SCORER_SYSTEM_PROMPT, user_message, **SCORER_PARAMS), produce
+        )
+        return _parse_turn_note(content, turn)
+    except (CircuitOpenError, DeadlineExceeded) as exc:
+        logger.warning("Skipping turn scoring: %s", exc)
+        return None
+    except Exception as exc:
+        logger.exception("Groq turn scoring failed: %s", exc)
+        return None
+
+
+def format_turn_notes(notes: Iterable[TurnNote]) -> List[str]:
+    """Render stored notes as one prompt line per answer, in interview order."""
+
+    lines: List[str] = []
+    for note in sorted(notes, key=lambda note: note["turn"]):
+        scores = ", ".join(f"{name} {value}/{MAX_SCORE}" for name, value in note["scores"].items())
+        lines.append(f"Question {note['turn'] + 1}: {scores or 'unscored'}. {note['comment']}".strip())
+    return lines
+
+
+def rubric_averages(notes: Iterable[TurnNote]) -> str:
+    """One line with the mean score per rubric dimension, or "" without scores."""
+
+    totals: Dict[str, List[int]] = {name: [] for name in RUBRIC_DIMENSIONS}
+    count = 0
+    for note in notes:
+        count += 1
+        for name, value in note["scores"].items():
+            totals.setdefault(name, []).append(value)
+    averages = ", ".join(
+        f"{name} {sum(values) / len(values):.1f}/{MAX_SCORE}" for name, values in totals.items() if values
+    )
+    return f"Average rubric scores across {count} answers: {averages}" if averages else ""
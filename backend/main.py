@@ -1,9 +1,43 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from clients import close_clients, init_clients, pool_stats
+from config import settings
+from db import close_mongo, ensure_indexes, init_mongo
+from jobs import archival_job, evaluation_jobs
+from llm.opening_pool import opening_pool
+from llm.model_router import model_router
+from llm.prompt_budget import prompt_stats
+from llm.question_bank import question_bank
+from llm.response_cache import response_cache
+from resilience import breaker_stats
 from routes import api_router
+from routes.session_cache import active_sessions
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_mongo()
+    await ensure_indexes()
+    await init_clients()
+    await evaluation_jobs.start()
+    if settings.opening_pool_enabled:
+        opening_pool.start()
+    if settings.archive_enabled:
+        archival_job.start()
+    try:
+        yield
+    finally:
+        await archival_job.stop()
+        await opening_pool.stop()
+        await evaluation_jobs.stop()
+        await close_clients()
+        await close_mongo()
 
-app = FastAPI(title="Interview Practice Partner API")
+
+app = FastAPI(title="Interview Practice Partner API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,4 +58,19 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "groq_pool": pool_stats(),
+        "circuit_breakers": breaker_stats(),
+        "prompt_tokens": prompt_stats(),
+        "opening_pool": opening_pool.stats(),
+        "llm_cache": response_cache.stats(),
+        "model_routing": model_router.stats(),
+        "question_bank": question_bank.stats(),
+        "active_sessions": active_sessions.stats(),
+        "archival": archival_job.stats(),
+    }
+
+
 app.include_router(api_router)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -7,9 +7,14 @@ class InterviewSession(BaseModel):
     user_id: str
     domain: str
     experience: str
-    questions: List[str] = Field(default_factory=list)
-    answers: List[str] = Field(default_factory=list)
-    behaviors: List[str] = Field(default_factory=list)
+    # Answered turns live in ``interview_turns`` buckets; the document keeps the pending question.
+    schema_version: int = 2
+    current_question: str = ""
+    question_signatures: List[bytes] = Field(default_factory=list)
     resume_context: Optional[str] = None
     candidate_name: Optional[str] = None
+    summary: Optional[str] = None
+    summary_turns: int = 0
+    turn_notes: List[Dict[str, Any]] = Field(default_factory=list)
+    turn_count: int = 0
     status: str = "active"
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+logger = logging.getLogger(__name__)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when the request deadline has already passed before a call starts."""
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """Bound every guarded call made inside the block by ``seconds`` from now."""
+
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time(default: float) -> float:
+    """Seconds left for a call: ``default`` capped by the active request deadline."""
+
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return min(default, deadline - time.monotonic())
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open probe after a cool-down."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self.total_failures = 0
+        self.total_rejections = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.total_rejections += 1
+        return False
+
+    def rejecting(self) -> bool:
+        """True while open and still cooling down; unlike ``allow`` this changes nothing."""
+
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without recording an outcome."""
+
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Circuit %s closed after a successful probe", self.name)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    "Circuit %s opened after %s consecutive failures",
+                    self.name,
+                    self.consecutive_failures,
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            failure_threshold=settings.breaker_failure_threshold,
+            reset_timeout=settings.breaker_reset_seconds,
+        )
+        _breakers[name] = breaker
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+async def guarded_call(
+    name: str,
+    call: Callable[[float], Awaitable[T]],
+    timeout: float,
+) -> T:
+    """Run ``call(timeout)`` behind the ``name`` circuit breaker and the request deadline."""
+
+    breaker = get_breaker(name)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit for {name} is open")
+    effective_timeout = remaining_time(timeout)
+    if effective_timeout <= 0:
+        breaker.release()
+        raise DeadlineExceeded(f"Request deadline exhausted before calling {name}")
+    try:
+        result = await asyncio.wait_for(call(effective_timeout), effective_timeout)
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
@@ -0,0 +1,70 @@
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from config import settings
+from db import (
+    EXPORT_FORMATS,
+    EXPORT_MAX_BATCH_SIZE,
+    EXPORT_MEDIA_TYPES,
+    ExportError,
+    columnar_available,
+    export_chunks,
+    export_filter,
+    get_interviews_collection,
+)
+
+router = APIRouter()
+
+
+def _require_export_token(token: Optional[str]) -> None:
+    # Bulk export spans every user's transcripts, so it is off unless an admin token is set.
+    if not settings.export_admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token or not secrets.compare_digest(token, settings.export_admin_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+@router.get("/interviews/export")
+async def export_interviews(
+    export_format: str = Query("ndjson", alias="format"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    domain: Optional[str] = None,
+    interview_status: Optional[str] = Query(None, alias="status"),
+    batch_size: int = Query(settings.export_batch_size, ge=1, le=EXPORT_MAX_BATCH_SIZE),
+    admin_token: Optional[str] = Header(None, alias="X-Admin-Token"),
+):
+    """Stream interviews as one row per question/answer, in NDJSON, Parquet, or Arrow."""
+
+    _require_export_token(admin_token)
+
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of {', '.join(EXPORT_FORMATS)}",
+        )
+    if export_format != "ndjson" and not columnar_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{export_format} export needs pyarrow installed on the server",
+        )
+    try:
+        query = export_filter(since, until, domain, interview_status)
+    except ExportError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if get_interviews_collection() is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database not configured",
+        )
+
+    extension = "arrows" if export_format == "arrow" else export_format
+    return StreamingResponse(
+        export_chunks(export_format, query, batch_size),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="interviews.{extension}"'},
+    )
@@ -1,21 +1,72 @@
-from itertools import zip_longest
+import asyncio
+import json
+import logging
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-
-from db import get_db, get_interviews_collection
-from llm import evaluate_interview, generate_interview_question
+from starlette.concurrency import run_in_threadpool
+
+from config import INTERVIEW_DOMAINS, settings
+from db import (
+    CLOSED_STATUSES,
+    InterviewRepository,
+    UserRepository,
+    get_interviews_repository,
+    get_users_repository,
+)
+from jobs import evaluation_jobs
+from llm import (
+    generate_interview_question,
+    history_from_session,
+    stream_interview_evaluation,
+    stream_interview_question,
+)
+from llm.interviewer import DEFAULT_BEHAVIOR, MAX_HISTORY_TURNS
+from llm.opening_pool import opening_pool
+from llm.similarity import MAX_SESSION_SIGNATURES, QuestionIndex, minhash_signature
+from llm.summarizer import summarize_turns
+from llm.turn_scorer import score_turn
 from models import InterviewSession
+from resilience import deadline_scope
 from resume_parser import build_resume_context, extract_resume_text
 
+from .session_cache import active_sessions
+
 router = APIRouter()
 RESUME_DIR = Path(__file__).resolve().parent.parent / "resumes"
+FEEDBACK_PENDING = "pending"
+FEEDBACK_READY = "ready"
+FEEDBACK_FAILED = "failed"
+FEEDBACK_POLL_SECONDS = 2.0
+FEEDBACK_STREAM_TIMEOUT_SECONDS = 180.0
+logger = logging.getLogger(__name__)
+
+
+def _interviews_repository() -> InterviewRepository:
+    interviews = get_interviews_repository()
+    if interviews is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database not configured",
+        )
+    return interviews
+
+
+def _users_repository() -> UserRepository:
+    users = get_users_repository()
+    if users is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database not configured",
+        )
+    return users
 
 
-def _ensure_resume_context(user_doc: dict[str, Any], db) -> str:
+async def _ensure_resume_context(user_doc: dict[str, Any], users: UserRepository) -> str:
     existing = (user_doc.get("resume_context") or "").strip()
     if existing:
         return existing
@@ -23,10 +74,11 @@ def _ensure_resume_context(user_doc: dict[str, Any], db) -> str:
     if not resume_url:
         return ""
     resume_path = RESUME_DIR / Path(resume_url).name
-    text = extract_resume_text(resume_path)
+    # Parsing PDFs/DOCX is CPU and file work, so it still runs in the threadpool.
+    text = await run_in_threadpool(extract_resume_text, resume_path)
     context = build_resume_context(text)
     if context:
-        db["users"].update_one({"_id": user_doc["_id"]}, {"$set": {"resume_context": context}})
+        await users.set_resume_context(user_doc["_id"], context)
     return context
 
 
@@ -62,6 +114,9 @@ class ProcessAnswerRequest(BaseModel):
     user_id: str
     answer: str
     behavior_override: Optional[str] = None
+    # Number of answers the client has already seen recorded; a stale value means this
+    # submit is a retry of a turn that already went through.
+    turn: Optional[int] = None
 
 
 class EndInterviewRequest(BaseModel):
@@ -71,50 +126,42 @@ class EndInterviewRequest(BaseModel):
 
 @router.get("/get-domains")
 def get_domains():
-    return {
-        "domains": [
-            "Sales",
-            "Python Developer",
-            "Full Stack Developer",
-            "Data Science",
-        ]
-    }
+    return {"domains": list(INTERVIEW_DOMAINS)}
 
 
 @router.post("/start-interview")
-def start_interview(payload: StartInterviewRequest):
-    collection = get_interviews_collection()
-    db = get_db()
-    if collection is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database not configured",
-        )
-    if db is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database not configured",
-        )
+async def start_interview(payload: StartInterviewRequest):
+    interviews = _interviews_repository()
+    users = _users_repository()
 
     try:
         user_object_id = ObjectId(payload.user_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid user id")
 
-    user = db["users"].find_one({"_id": user_object_id})
+    user = await users.get(user_object_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User profile not found")
 
-    resume_context = _ensure_resume_context(user, db)
+    resume_context = await _ensure_resume_context(user, users)
     candidate_name = (user.get("name") or "").strip()
 
-    first_question = generate_interview_question(
-        [],
-        payload.domain,
-        payload.experience,
-        resume_context=resume_context,
-        candidate_name=candidate_name,
-    )
+    # Resume-grounded openers must be tailored, so only generic sessions use the pool.
+    pooled_question = None if resume_context else opening_pool.pop(payload.domain, payload.experience)
+    if pooled_question:
+        first_question = {"question": pooled_question, "behavior": DEFAULT_BEHAVIOR}
+    else:
+        with deadline_scope(settings.request_deadline_seconds):
+            first_question = await generate_interview_question(
+                [],
+                payload.domain,
+                payload.experience,
+                resume_context=resume_context,
+                candidate_name=candidate_name,
+            )
+    # Sign the question itself: the greeting, name, and domain added below would dilute it
+    # and let a later near-repeat of the opening slip under the duplicate cut-off.
+    opening_signature = minhash_signature(first_question.get("question", ""))
     first_question["question"] = _personalize_opening(
         first_question.get("question", ""),
         candidate_name,
@@ -124,40 +171,51 @@ def start_interview(payload: StartInterviewRequest):
         user_id=payload.user_id,
         domain=payload.domain,
         experience=payload.experience,
-        questions=[first_question["question"]],
-        answers=[],
-        behaviors=[],
+        current_question=first_question["question"],
+        question_signatures=[opening_signature],
         resume_context=resume_context,
         candidate_name=candidate_name,
     )
-    result = collection.insert_one(session.model_dump())
+    interview_object_id = await interviews.create(session.model_dump())
     return {
-        "interview_id": str(result.inserted_id),
+        "interview_id": str(interview_object_id),
         "question": first_question["question"],
     }
 
 
-@router.post("/process-answer")
-def process_answer(payload: ProcessAnswerRequest):
-    collection = get_interviews_collection()
-    if collection is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database not configured",
-        )
-    db = get_db()
+async def _load_answer_turn(
+    payload: ProcessAnswerRequest,
+) -> Tuple[InterviewRepository, ObjectId, dict[str, Any], List[dict[str, str]], str]:
+    interviews = _interviews_repository()
 
     try:
         interview_object_id = ObjectId(payload.interview_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid interview id")
 
-    session = collection.find_one({"_id": interview_object_id, "user_id": payload.user_id})
+    # Without the client's turn the cached entry cannot be checked against it, and
+    # another process may have served the last turn, so only a matching turn skips Mongo.
+    session = active_sessions.get(payload.interview_id, payload.user_id) if payload.turn is not None else None
+    if session is not None and payload.turn != session["turn_count"]:
+        # Another process may have served the last turn; ask Mongo before calling it a conflict.
+        active_sessions.invalidate(payload.interview_id)
+        session = None
     if session is None:
-        raise HTTPException(status_code=404, detail="Interview not found")
-
-    if session.get("status") == "completed":
+        session = await interviews.get_recent(interview_object_id, payload.user_id, MAX_HISTORY_TURNS)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        if session.get("turn_count") is None:
+            # Sessions created before the turn counter are read in full once; committing
+            # this turn adds the counter.
+            session = await interviews.get(interview_object_id, payload.user_id) or session
+            session["turn_count"] = len(session.get("answers") or [])
+        elif interviews.is_bucketed(session) and session.get("status") not in CLOSED_STATUSES:
+            active_sessions.put(payload.interview_id, session)
+
+    if session.get("status") in CLOSED_STATUSES:
         raise HTTPException(status_code=400, detail="Interview already completed")
+    if payload.turn is not None and payload.turn != session["turn_count"]:
+        raise HTTPException(status_code=409, detail=_turn_conflict(session))
 
     questions = session.get("questions", []) or []
     answers = session.get("answers", []) or []
@@ -169,82 +227,424 @@ def process_answer(payload: ProcessAnswerRequest):
     history.append({"question": last_question, "answer": payload.answer})
 
     candidate_name = (session.get("candidate_name") or "").strip()
-    if not candidate_name and db is not None:
+    users = get_users_repository()
+    if not candidate_name and users is not None:
         try:
             user_object_id = ObjectId(payload.user_id)
-            user_doc = db["users"].find_one({"_id": user_object_id})
+            user_doc = await users.get(user_object_id, {"name": 1})
             candidate_name = (user_doc or {}).get("name", "")
         except Exception:
             candidate_name = ""
 
-    next_question = generate_interview_question(
-        history,
-        session.get("domain", ""),
-        session.get("experience", ""),
-        behavior_override=payload.behavior_override,
-        resume_context=session.get("resume_context"),
-        candidate_name=candidate_name,
-    )
+    return interviews, interview_object_id, session, history, candidate_name
+
+
+def _turn_conflict(session: dict[str, Any]) -> dict[str, Any]:
+    """What a client needs to resync after submitting an already-recorded turn."""
 
-    update_ops = {
-        "$push": {"answers": payload.answer},
+    questions = session.get("questions") or []
+    return {
+        "message": "This turn was already answered",
+        "turn": int(session.get("turn_count") or 0),
+        "question": questions[-1] if questions else "",
     }
+
+
+async def _record_answer_turn(
+    interviews: InterviewRepository,
+    interview_object_id: ObjectId,
+    payload: ProcessAnswerRequest,
+    session: dict[str, Any],
+    candidate_name: str,
+    next_question: Optional[dict[str, str]],
+) -> bool:
+    """Commit the answer and next question in one guarded write; False if the turn was taken."""
+
+    update_ops: dict[str, Any] = {}
+    signature: Optional[bytes] = None
     if next_question:
-        update_ops["$push"]["questions"] = next_question["question"]
-        update_ops["$push"]["behaviors"] = next_question["behavior"]
+        questions = session.get("questions") or []
+        signatures = session.get("question_signatures") or []
+        if len(signatures) < len(questions):
+            # Sessions created before the similarity index get their signatures backfilled.
+            update_ops["$set"] = {
+                "question_signatures": [
+                    minhash_signature(question) for question in [*questions, next_question["question"]]
+                ][-MAX_SESSION_SIGNATURES:]
+            }
+        else:
+            signature = minhash_signature(next_question["question"])
+            update_ops["$push"] = {
+                "question_signatures": {"$each": [signature], "$slice": -MAX_SESSION_SIGNATURES}
+            }
     if candidate_name and not session.get("candidate_name"):
         update_ops.setdefault("$set", {})["candidate_name"] = candidate_name
 
-    collection.update_one(
-        {"_id": interview_object_id, "user_id": payload.user_id},
+    committed = await interviews.record_turn(
+        session,
+        payload.user_id,
+        payload.answer,
+        next_question["question"] if next_question else None,
+        next_question["behavior"] if next_question else None,
         update_ops,
     )
-    return {"question": next_question["question"], "behavior": next_question["behavior"]}
+    if committed is None:
+        active_sessions.invalidate(payload.interview_id)
+        return False
+    if interviews.is_bucketed(session):
+        active_sessions.put(
+            payload.interview_id,
+            _advance_session(session, payload.answer, next_question, signature, candidate_name, committed),
+        )
+    return True
+
+
+def _advance_session(
+    session: dict[str, Any],
+    answer: str,
+    next_question: Optional[dict[str, str]],
+    signature: Optional[bytes],
+    candidate_name: str,
+    turn_count: int,
+) -> dict[str, Any]:
+    """The prompt window ``get_recent`` would return after this turn, built locally."""
+
+    questions = session.get("questions") or [""]
+    current_question = next_question["question"] if next_question else questions[-1]
+    signatures = session.get("question_signatures") or []
+    if signature is not None:
+        signatures = [*signatures, signature][-MAX_SESSION_SIGNATURES:]
+    return {
+        **session,
+        "turn_count": turn_count,
+        "current_question": current_question,
+        "questions": [*questions, current_question][-MAX_HISTORY_TURNS:],
+        "answers": [*(session.get("answers") or []), answer][-(MAX_HISTORY_TURNS - 1):],
+        "behaviors": [
+            *(session.get("behaviors") or []),
+            next_question["behavior"] if next_question else None,
+        ][-(MAX_HISTORY_TURNS - 1):],
+        "question_signatures": signatures,
+        "candidate_name": session.get("candidate_name") or candidate_name or None,
+    }
 
 
-@router.post("/end-interview")
-def end_interview(payload: EndInterviewRequest):
-    collection = get_interviews_collection()
-    if collection is None:
+async def _current_turn_conflict(
+    interviews: InterviewRepository, interview_object_id: ObjectId, user_id: str
+) -> dict[str, Any]:
+    session = await interviews.get_recent(interview_object_id, user_id, MAX_HISTORY_TURNS) or {}
+    return _turn_conflict(session)
+
+
+async def _refresh_session_summary(
+    interviews: InterviewRepository,
+    interview_object_id: ObjectId,
+    session: dict[str, Any],
+    target: int,
+) -> None:
+    """Fold turns that slid out of the prompt window into the stored session summary."""
+
+    covered = int(session.get("summary_turns") or 0)
+    source = session
+    if not interviews.is_bucketed(session):
+        # Older sessions keep their turns inline, so slicing them needs the full arrays.
+        source = await interviews.get(
+            interview_object_id, projection={"questions": 1, "answers": 1, "schema_version": 1}
+        )
+        if source is None:
+            return
+    summary = await summarize_turns(
+        session.get("summary"), await interviews.turns(source, covered, target), session.get("domain", "")
+    )
+    if summary is None:
+        return
+    if await interviews.update(
+        interview_object_id,
+        {"$set": {"summary": summary, "summary_turns": target}},
+        conditions={"summary_turns": session.get("summary_turns")},
+    ):
+        active_sessions.update(str(interview_object_id), {"summary": summary, "summary_turns": target})
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _score_answered_turn(
+    interviews: InterviewRepository,
+    interview_object_id: ObjectId,
+    turn: int,
+    question: str,
+    answer: str,
+    domain: str,
+    experience: str,
+) -> None:
+    """Store rubric notes for the turn just answered so the final evaluation only combines them."""
+
+    note = await score_turn(turn, question, answer, domain, experience)
+    if note is None:
+        return
+    await interviews.add_turn_note(interview_object_id, note)
+
+
+def _schedule_turn_tasks(
+    background_tasks: BackgroundTasks,
+    interviews: InterviewRepository,
+    interview_object_id: ObjectId,
+    session: dict[str, Any],
+    history: List[dict[str, str]],
+) -> None:
+    # The next prompt shows the latest MAX_HISTORY_TURNS - 1 answered turns plus the new
+    # one; only schedule a refresh (and its reads) once turns fall out of that window.
+    answered = int(session["turn_count"]) + 1
+    target = max(0, answered - (MAX_HISTORY_TURNS - 1))
+    if target > int(session.get("summary_turns") or 0):
+        background_tasks.add_task(_refresh_session_summary, interviews, interview_object_id, session, target)
+    if settings.turn_scoring_enabled:
+        background_tasks.add_task(
+            _score_answered_turn,
+            interviews,
+            interview_object_id,
+            session["turn_count"],
+            history[-1]["question"],
+            history[-1]["answer"],
+            session.get("domain", ""),
+            session.get("experience", ""),
+        )
+
+
+@router.post("/process-answer")
+async def process_answer(payload: ProcessAnswerRequest, background_tasks: BackgroundTasks):
+    interviews, interview_object_id, session, history, candidate_name = await _load_answer_turn(payload)
+
+    with deadline_scope(settings.request_deadline_seconds):
+        next_question = await generate_interview_question(
+            history,
+            session.get("domain", ""),
+            session.get("experience", ""),
+            behavior_override=payload.behavior_override,
+            resume_context=session.get("resume_context"),
+            candidate_name=candidate_name,
+            question_index=QuestionIndex.from_session(session),
+            session_summary=session.get("summary"),
+        )
+
+    if not await _record_answer_turn(
+        interviews, interview_object_id, payload, session, candidate_name, next_question
+    ):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database not configured",
+            status_code=409,
+            detail=await _current_turn_conflict(interviews, interview_object_id, payload.user_id),
         )
+    _schedule_turn_tasks(background_tasks, interviews, interview_object_id, session, history)
+    return {"question": next_question["question"], "behavior": next_question["behavior"]}
+
+
+@router.post("/process-answer/stream")
+async def process_answer_stream(payload: ProcessAnswerRequest, background_tasks: BackgroundTasks):
+    """Server-sent events variant of /process-answer."""
+
+    interviews, interview_object_id, session, history, candidate_name = await _load_answer_turn(payload)
+
+    async def event_stream() -> AsyncIterator[str]:
+        next_question: Optional[dict[str, str]] = None
+        with deadline_scope(settings.request_deadline_seconds):
+            async for item in stream_interview_question(
+                history,
+                session.get("domain", ""),
+                session.get("experience", ""),
+                behavior_override=payload.behavior_override,
+                resume_context=session.get("resume_context"),
+                candidate_name=candidate_name,
+                question_index=QuestionIndex.from_session(session),
+                session_summary=session.get("summary"),
+            ):
+                if item["event"] == "token":
+                    yield _sse_event("token", {"text": item["text"]})
+                elif item["event"] == "behavior":
+                    yield _sse_event("behavior", {"behavior": item["behavior"]})
+                else:
+                    next_question = {"question": item["question"], "behavior": item["behavior"]}
+
+        if not await _record_answer_turn(
+            interviews, interview_object_id, payload, session, candidate_name, next_question
+        ):
+            yield _sse_event(
+                "conflict", await _current_turn_conflict(interviews, interview_object_id, payload.user_id)
+            )
+            return
+        # Background tasks run after the body is sent, so scheduling here still works
+        # and skips them for a submit that lost the race.
+        _schedule_turn_tasks(background_tasks, interviews, interview_object_id, session, history)
+        yield _sse_event("done", next_question or {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/end-interview")
+async def end_interview(payload: EndInterviewRequest):
+    """Close the session and queue its evaluation."""
+
+    interviews = _interviews_repository()
 
     try:
         interview_object_id = ObjectId(payload.interview_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid interview id")
 
-    session = collection.find_one({"_id": interview_object_id, "user_id": payload.user_id})
+    session = await interviews.complete(
+        interview_object_id, payload.user_id, {"feedback": 1, "feedback_status": 1, "status": 1}
+    )
+    active_sessions.invalidate(payload.interview_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Interview not found")
+    if session.get("status") == "archived":
+        return _feedback_payload(await interviews.get_archived(interview_object_id, payload.user_id) or {})
+
+    feedback_status = session.get("feedback_status")
+    if feedback_status == FEEDBACK_FAILED or (
+        feedback_status in (None, FEEDBACK_PENDING) and not session.get("feedback")
+    ):
+        await interviews.update(
+            interview_object_id,
+            {"$set": {"feedback_status": FEEDBACK_PENDING}, "$unset": {"feedback": ""}},
+            conditions={"feedback_status": {"$ne": FEEDBACK_READY}},
+        )
+        await evaluation_jobs.enqueue(interview_object_id, payload.user_id)
+        return {"feedback": "", "feedback_status": FEEDBACK_PENDING}
+    return _feedback_payload(session)
 
-    recorded_questions = list(session.get("questions", []) or [])
-    recorded_answers = list(session.get("answers", []) or [])
 
-    # If the interviewer asked an extra question that never received an answer,
-    # drop it so the evaluator does not assume the candidate skipped it.
-    while recorded_questions and len(recorded_questions) > len(recorded_answers):
-        recorded_questions.pop()
+def _feedback_payload(session: dict[str, Any]) -> dict[str, str]:
+    feedback = session.get("feedback") or ""
+    feedback_status = session.get("feedback_status") or (FEEDBACK_READY if feedback else FEEDBACK_PENDING)
+    return {"feedback": feedback, "feedback_status": feedback_status}
 
-    history: List[dict[str, str]] = [
-        {"question": question or "", "answer": answer or ""}
-        for question, answer in zip_longest(
-            recorded_questions,
-            recorded_answers,
-            fillvalue="",
-        )
-    ]
 
-    feedback = evaluate_interview(
-        history,
-        session.get("domain", ""),
-        session.get("experience", ""),
+async def _load_feedback(interview_id: str, user_id: str) -> dict[str, str]:
+    interviews = _interviews_repository()
+    try:
+        interview_object_id = ObjectId(interview_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid interview id")
+
+    session = await interviews.get(
+        interview_object_id, user_id, {"feedback": 1, "feedback_status": 1, "status": 1}
     )
+    if session is None:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    if session.get("status") not in CLOSED_STATUSES:
+        raise HTTPException(status_code=409, detail="Interview has not ended yet")
+    if session.get("status") == "archived":
+        # The feedback text moved to the archive with the transcript.
+        session = await interviews.get_archived(interview_object_id, user_id) or session
+    return _feedback_payload(session)
+
+
+@router.get("/interview-feedback/{interview_id}")
+async def get_interview_feedback(interview_id: str, user_id: str):
+    """Poll the evaluation status; ``feedback`` is filled once the status is ready."""
+
+    return await _load_feedback(interview_id, user_id)
 
-    collection.update_one(
-        {"_id": interview_object_id, "user_id": payload.user_id},
-        {"$set": {"status": "completed", "feedback": feedback}},
+
+async def _follow_feedback(
+    interview_id: str, user_id: str, current: dict[str, str]
+) -> AsyncIterator[dict[str, str]]:
+    """Yield the feedback status until it leaves ``pending`` or the wait times out."""
+
+    waited = 0.0
+    while True:
+        yield current
+        if current["feedback_status"] != FEEDBACK_PENDING or waited >= FEEDBACK_STREAM_TIMEOUT_SECONDS:
+            return
+        # Wakes early when this process finishes the job; the re-read covers other workers.
+        await evaluation_jobs.wait(interview_id, FEEDBACK_POLL_SECONDS)
+        waited += FEEDBACK_POLL_SECONDS
+        current = await _load_feedback(interview_id, user_id)
+
+
+@router.get("/interview-feedback/{interview_id}/events")
+async def stream_interview_feedback(interview_id: str, user_id: str):
+    """Server-sent events that push the evaluation status until it is ready or failed."""
+
+    first = await _load_feedback(interview_id, user_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for current in _follow_feedback(interview_id, user_id, first):
+            yield _sse_event("status", current)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/interview-feedback/{interview_id}/stream")
+async def stream_interview_feedback_tokens(interview_id: str, user_id: str):
+    """Stream the evaluator feedback itself as server-sent ``token`` events."""
+
+    first = await _load_feedback(interview_id, user_id)
+    interview_object_id = ObjectId(interview_id)
+    interviews = _interviews_repository()
+
+    async def finished_feedback(current: dict[str, str]) -> AsyncIterator[str]:
+        latest = current
+        async for latest in _follow_feedback(interview_id, user_id, current):
+            if latest["feedback_status"] == FEEDBACK_PENDING:
+                yield _sse_event("status", latest)
+        if latest["feedback"]:
+            yield _sse_event("token", {"text": latest["feedback"]})
+        yield _sse_event("done", latest)
+
+    async def event_stream() -> AsyncIterator[str]:
+        job = None
+        if first["feedback_status"] == FEEDBACK_PENDING:
+            job = await evaluation_jobs.claim(interview_object_id)
+        if job is None:
+            async for event in finished_feedback(first):
+                yield event
+            return
+
+        completed = False
+        try:
+            session = await interviews.get_transcript(interview_object_id)
+            parts: List[str] = []
+            async with evaluation_jobs.lease(job):
+                with deadline_scope(settings.request_deadline_seconds):
+                    async for text in stream_interview_evaluation(
+                        history_from_session(session or {}),
+                        (session or {}).get("domain", ""),
+                        (session or {}).get("experience", ""),
+                        turn_notes=(session or {}).get("turn_notes"),
+                    ):
+                        parts.append(text)
+                        yield _sse_event("token", {"text": text})
+            feedback = "".join(parts).strip()
+            if not feedback:
+                raise RuntimeError("Evaluator returned an empty stream")
+            await evaluation_jobs.complete(job, feedback)
+            completed = True
+            yield _sse_event("done", {"feedback": feedback, "feedback_status": FEEDBACK_READY})
+        except Exception as exc:
+            logger.warning("Streaming evaluation for %s failed: %s", interview_id, exc)
+            await evaluation_jobs.release(job)
+            completed = True
+            yield _sse_event("reset", {})
+            async for event in finished_feedback(await _load_feedback(interview_id, user_id)):
+                yield event
+        finally:
+            if not completed:
+                # Client went away mid-stream; let a background worker finish the job.
+                await asyncio.shield(evaluation_jobs.release(job))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return {"feedback": feedback}
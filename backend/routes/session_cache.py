@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from config import settings
+
+
+class ActiveSessionCache:
+    """LRU of in-progress interview state, so sticky-routed turns skip the Mongo read."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, interview_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._entries.get(interview_id)
+        if cached is not None:
+            expires_at, session = cached
+            if expires_at > time.monotonic() and session.get("user_id") == user_id:
+                self._entries.move_to_end(interview_id)
+                self.hits += 1
+                return dict(session)
+            if expires_at <= time.monotonic():
+                del self._entries[interview_id]
+        self.misses += 1
+        return None
+
+    def put(self, interview_id: str, session: Mapping[str, Any]) -> None:
+        if not self.enabled:
+            return
+        cached = self._entries.get(interview_id)
+        if cached is not None and int(cached[1].get("turn_count") or 0) > int(session.get("turn_count") or 0):
+            return
+        self._entries[interview_id] = (time.monotonic() + self.ttl_seconds, dict(session))
+        self._entries.move_to_end(interview_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def update(self, interview_id: str, fields: Mapping[str, Any]) -> None:
+        """Apply fields written outside the turn path (e.g. the summary) to a cached entry."""
+
+        cached = self._entries.get(interview_id)
+        if cached is not None:
+            expires_at, session = cached
+            self._entries[interview_id] = (expires_at, {**session, **fields})
+
+    def invalidate(self, interview_id: str) -> None:
+        if self._entries.pop(interview_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+active_sessions = ActiveSessionCache(
+    max_entries=settings.session_cache_max_entries,
+    ttl_seconds=settings.session_cache_ttl_seconds,
+)
@@ -1,10 +1,13 @@
 import logging
 from pathlib import Path
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from bson import ObjectId
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 
-from db import get_db
+from db import INTERVIEW_STATUSES, InterviewRepository, get_interviews_repository, get_users_repository
 from models import UserRegistration
 from resume_parser import build_resume_context, extract_resume_text
 
@@ -20,9 +23,9 @@ def _resolve_resume_path(resume_reference: str) -> Path:
     return RESUME_DIR / safe_name
 
 @router.post("/register-user")
-def register_user(payload: UserRegistration):
-    db = get_db()
-    if db is None:
+async def register_user(payload: UserRegistration):
+    users = get_users_repository()
+    if users is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database not configured",
@@ -33,7 +36,7 @@ def register_user(payload: UserRegistration):
     resume_context = ""
     if resume_url:
         resume_path = _resolve_resume_path(resume_url)
-        resume_text = extract_resume_text(resume_path)
+        resume_text = await run_in_threadpool(extract_resume_text, resume_path)
         resume_context = build_resume_context(resume_text)
         if resume_context:
             document["resume_context"] = resume_context
@@ -42,9 +45,9 @@ def register_user(payload: UserRegistration):
 
     document["resume_present"] = bool(resume_url)
 
-    result = db["users"].insert_one(document)
-    print(f"Inserted user {result.inserted_id}")
-    return {"user_id": str(result.inserted_id)}
+    user_id = await users.create(document)
+    print(f"Inserted user {user_id}")
+    return {"user_id": str(user_id)}
 
 @router.post("/upload-resume")
 async def upload_resume(file: UploadFile = File(...)):
@@ -65,3 +68,87 @@ async def upload_resume(file: UploadFile = File(...)):
 
     resume_url = f"resumes/{unique_name}"
     return {"resume_url": resume_url, "filename": file.filename}
+
+
+def _history_repository(user_id: str) -> InterviewRepository:
+    try:
+        ObjectId(user_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid user id")
+    interviews = get_interviews_repository()
+    if interviews is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database not configured",
+        )
+    return interviews
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+@router.get("/users/{user_id}/interviews")
+async def list_user_interviews(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    interview_status: Optional[str] = Query(None, alias="status"),
+):
+    """Page through a user's interviews, newest first."""
+
+    interviews = _history_repository(user_id)
+    before = None
+    if cursor:
+        try:
+            before = ObjectId(cursor)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if interview_status is not None and interview_status not in INTERVIEW_STATUSES:
+        raise HTTPException(status_code=400, detail="Unknown interview status")
+
+    statuses = (interview_status,) if interview_status else INTERVIEW_STATUSES
+    # One extra row tells us whether another page exists.
+    rows = await interviews.list_for_user(user_id, limit + 1, before, statuses)
+    page = rows[:limit]
+    return {
+        "interviews": [
+            {
+                "interview_id": str(row["_id"]),
+                "started_at": row["_id"].generation_time.isoformat(),
+                "domain": row.get("domain", ""),
+                "experience": row.get("experience", ""),
+                "status": row.get("status", ""),
+                "turns": int(row.get("turns") or 0),
+                "feedback_status": row.get("feedback_status"),
+                "verdict": row.get("verdict"),
+            }
+            for row in page
+        ],
+        "next_cursor": str(page[-1]["_id"]) if len(rows) > limit else None,
+    }
+
+
+@router.get("/users/{user_id}/interviews/stats")
+async def user_interview_stats(user_id: str):
+    """Progress summary: sessions per domain, average turns, and verdict distribution."""
+
+    interviews = _history_repository(user_id)
+    stats = await interviews.stats_for_user(user_id)
+    totals: Dict[str, Any] = (stats.get("totals") or [{}])[0]
+    return {
+        "sessions": totals.get("sessions", 0),
+        "completed": totals.get("completed", 0),
+        "average_turns": _round(totals.get("average_turns")),
+        "average_score": _round(totals.get("average_score")),
+        "domains": [
+            {
+                "domain": entry["_id"],
+                "sessions": entry["sessions"],
+                "average_turns": _round(entry.get("average_turns")),
+                "average_score": _round(entry.get("average_score")),
+            }
+            for entry in stats.get("domains") or []
+        ],
+        "verdicts": {entry["_id"]: entry["count"] for entry in stats.get("verdicts") or []},
+    }
@@ -2,6 +2,8 @@ from fastapi import APIRouter, File, HTTPException, UploadFile, status
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from config import settings
+from resilience import deadline_scope
 from voice import generate_tts_audio, transcribe_audio
 
 router = APIRouter()
@@ -10,7 +12,8 @@ router = APIRouter()
 @router.post("/voice-to-text")
 async def voice_to_text(file: UploadFile = File(...)):
     payload = await file.read()
-    transcript = transcribe_audio(payload, file.filename, file.content_type)
+    with deadline_scope(settings.request_deadline_seconds):
+        transcript = await transcribe_audio(payload, file.filename, file.content_type)
     if not transcript:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -4,28 +4,20 @@ import logging
 from io import BytesIO
 from typing import Optional
 
-from groq import Groq
-
+from clients import get_groq_client
 from config import settings
+from resilience import CircuitOpenError, DeadlineExceeded, guarded_call
 
 SPEECH_MODEL = "whisper-large-v3"
-_client: Optional[Groq] = None
 logger = logging.getLogger(__name__)
 
 
-def _get_client() -> Optional[Groq]:
-    global _client
-    if _client is None and settings.groq_api_key:
-        _client = Groq(api_key=settings.groq_api_key)
-    return _client
-
-
-def transcribe_audio(
+async def transcribe_audio(
     file_bytes: bytes,
     filename: str,
     mime_type: Optional[str] = None,
 ) -> str:
-    client = _get_client()
+    client = get_groq_client()
     if client is None or not file_bytes:
         logger.warning("Transcription skipped: missing client or empty audio payload")
         return ""
@@ -35,15 +27,23 @@ def transcribe_audio(
     buffer.seek(0)
 
     try:
-        response = client.audio.transcriptions.create(
-            model=SPEECH_MODEL,
-            file=buffer,
-            response_format="json",
+        response = await guarded_call(
+            SPEECH_MODEL,
+            lambda timeout: client.audio.transcriptions.create(
+                model=SPEECH_MODEL,
+                file=buffer,
+                response_format="json",
+                timeout=timeout,
+            ),
+            settings.stt_timeout_seconds,
         )
         text = getattr(response, "text", "")
         if not text and isinstance(response, dict):
             text = response.get("text", "")
         return text.strip()
+    except (CircuitOpenError, DeadlineExceeded) as exc:
+        logger.warning("Transcription skipped: %s", exc)
+        return ""
     except Exception as exc:
         logger.exception("Groq transcription failed: %s", exc)
         return ""
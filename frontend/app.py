@@ -1,6 +1,7 @@
 import os
 import base64
-from typing import Optional
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 import streamlit as st
@@ -349,6 +350,27 @@ def start_mock_interview() -> None:
     _request_rerun()
 
 
+def _iter_sse_events(response: requests.Response) -> Iterator[Tuple[str, dict]]:
+    event = "message"
+    data_lines = []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                try:
+                    data = json.loads("\n".join(data_lines))
+                except ValueError:
+                    data = {}
+                yield event, data if isinstance(data, dict) else {}
+            event = "message"
+            data_lines = []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
 def submit_answer_to_mock_interview(answer: str) -> None:
     text = (answer or "").strip()
     if not text:
@@ -364,21 +386,53 @@ def submit_answer_to_mock_interview(answer: str) -> None:
         "interview_id": interview_id,
         "user_id": get_user_identifier(),
         "answer": text,
+        "turn": len(st.session_state.get("qa_history", [])),
     }
 
-    with st.spinner("Submitting answer..."):
+    next_question = ""
+    streamed_text = ""
+    conflict: Dict[str, Any] = {}
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        placeholder.caption("Interviewer is typing...")
         try:
-            response = requests.post(
-                f"{BACKEND_URL}/process-answer",
+            with requests.post(
+                f"{BACKEND_URL}/process-answer/stream",
                 json=payload,
+                stream=True,
                 timeout=60,
-            )
-            response.raise_for_status()
+            ) as response:
+                if response.status_code == 409:
+                    conflict = response.json().get("detail") or {}
+                else:
+                    response.raise_for_status()
+                    for event, data in _iter_sse_events(response):
+                        if event == "token":
+                            streamed_text += data.get("text", "")
+                            placeholder.write(streamed_text)
+                        elif event == "done":
+                            next_question = (data.get("question") or "").strip()
+                        elif event == "conflict":
+                            conflict = data
         except requests.RequestException as exc:
+            placeholder.empty()
             st.error(f"Unable to process answer: {exc}")
             return
 
-    next_question = response.json().get("question", "").strip()
+    if conflict:
+        # The backend already has this turn (a retry or double submit); pick up its state.
+        placeholder.empty()
+        history = st.session_state.setdefault("qa_history", [])
+        if len(history) < int(conflict.get("turn") or 0):
+            history.append({"question": st.session_state.get("interview_question", ""), "answer": text})
+        st.session_state["interview_question"] = conflict.get("question") or st.session_state.get(
+            "interview_question", ""
+        )
+        st.session_state["pending_answer_text"] = ""
+        set_alert("That answer was already recorded. Continuing from the latest question.", "warning")
+        _request_rerun()
+        return
+
     st.session_state.setdefault("qa_history", [])
     st.session_state["qa_history"].append(
         {
@@ -396,6 +450,32 @@ def submit_answer_to_mock_interview(answer: str) -> None:
     _request_rerun()
 
 
+def stream_feedback(interview_id: str, user_id: str) -> dict:
+    """Render evaluator feedback token by token; returns the final status payload."""
+
+    latest: dict = {}
+    parts: List[str] = []
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        with requests.get(
+            f"{BACKEND_URL}/interview-feedback/{interview_id}/stream",
+            params={"user_id": user_id},
+            stream=True,
+            timeout=(10, 120),
+        ) as response:
+            response.raise_for_status()
+            for event, data in _iter_sse_events(response):
+                if event == "token":
+                    parts.append(data.get("text", ""))
+                    placeholder.markdown("".join(parts))
+                elif event == "reset":
+                    parts = []
+                    placeholder.markdown("_Retrying evaluation..._")
+                elif event == "done":
+                    latest = data
+    return latest
+
+
 def complete_mock_interview() -> None:
     interview_id = st.session_state.get("interview_id")
     if not interview_id:
@@ -407,19 +487,22 @@ def complete_mock_interview() -> None:
         "user_id": get_user_identifier(),
     }
 
-    with st.spinner("Generating evaluation..."):
-        try:
+    try:
+        with st.spinner("Ending interview..."):
             response = requests.post(
                 f"{BACKEND_URL}/end-interview",
                 json=payload,
-                timeout=60,
+                timeout=30,
             )
             response.raise_for_status()
-        except requests.RequestException as exc:
-            st.error(f"Unable to end interview: {exc}")
-            return
+            data = response.json()
+        if data.get("feedback_status") == "pending":
+            data = stream_feedback(interview_id, payload["user_id"])
+    except requests.RequestException as exc:
+        st.error(f"Unable to end interview: {exc}")
+        return
 
-    feedback = response.json().get("feedback", "").strip()
+    feedback = (data.get("feedback") or "").strip()
     st.session_state["evaluation_feedback"] = feedback or "Thanks for completing the mock interview."
     st.session_state["last_interview_id"] = interview_id
     st.session_state["interview_id"] = ""